@@ -83,6 +83,7 @@ deploy_infrastructure() {
   COGNITO_USER_POOL_ID=$(terraform output -raw cognito_user_pool_id)
   COGNITO_CLIENT_ID=$(terraform output -raw cognito_client_id)
   CLOUDFRONT_DOMAIN=$(terraform output -raw cloudfront_distribution_domain)
+  BACKFILL_BALANCES_LAMBDA=$(terraform output -raw backfill_balances_lambda_name)
   
   # Get S3 bucket name
   S3_BUCKET_NAME=$(terraform output -raw frontend_bucket_name 2>/dev/null || echo "")
@@ -107,6 +108,37 @@ deploy_infrastructure() {
   export COGNITO_CLIENT_ID
   export CLOUDFRONT_DOMAIN
   export S3_BUCKET_NAME
+  export BACKFILL_BALANCES_LAMBDA
+}
+
+# Rebuild balance checkpoints for users whose transactions predate them
+backfill_balances() {
+  print_section "Backfilling balance checkpoints"
+  
+  # Users that are already checkpointed are skipped, so this is cheap on later deploys
+  local payload='{}'
+  while true; do
+    aws lambda invoke \
+      --function-name "${BACKFILL_BALANCES_LAMBDA}" \
+      --cli-binary-format raw-in-base64-out \
+      --cli-read-timeout 0 \
+      --payload "${payload}" \
+      /tmp/backfill-balances.json > /dev/null || print_error "Failed to invoke the balance backfill"
+    
+    if grep -q '"errorMessage"' /tmp/backfill-balances.json; then
+      print_error "Balance backfill failed: $(cat /tmp/backfill-balances.json)"
+    fi
+    
+    # Continue from where the previous invocation stopped, if it ran out of time
+    local last_key
+    last_key=$(python3 -c 'import json, sys; print(json.dumps(json.load(sys.stdin).get("lastEvaluatedKey") or ""))' < /tmp/backfill-balances.json)
+    if [ "${last_key}" = '""' ]; then
+      break
+    fi
+    payload="{\"lastEvaluatedKey\": ${last_key}}"
+  done
+  
+  print_success "Balance checkpoints backfilled"
 }
 
 # Update frontend environment variables
@@ -184,6 +216,7 @@ main() {
   
   check_requirements
   deploy_infrastructure
+  backfill_balances
   update_frontend_env
   build_frontend
   deploy_frontend
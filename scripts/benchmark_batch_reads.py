@@ -0,0 +1,149 @@
+"""
+Benchmark the batch read path against the per-user loop used by admin jobs.
+
+Runs against DynamoDB Local (or any DynamoDB endpoint) with throwaway tables:
+
+    docker run -p 8000:8000 amazon/dynamodb-local
+    python scripts/benchmark_batch_reads.py --users 2000 --transactions-per-user 20
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'lambda', 'layers', 'python'))
+
+from utils.batch_reads import (  # noqa: E402
+    create_client,
+    batch_get_profiles,
+    fetch_transactions_for_users,
+    query_user_transactions
+)
+from utils.dynamodb_utils import deserialize_from_dynamodb  # noqa: E402
+
+def create_tables(dynamodb, profiles_table, transactions_table):
+    dynamodb.create_table(
+        TableName=profiles_table,
+        KeySchema=[{'AttributeName': 'userId', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[{'AttributeName': 'userId', 'AttributeType': 'S'}],
+        BillingMode='PAY_PER_REQUEST'
+    )
+    dynamodb.create_table(
+        TableName=transactions_table,
+        KeySchema=[
+            {'AttributeName': 'userId', 'KeyType': 'HASH'},
+            {'AttributeName': 'id', 'KeyType': 'RANGE'}
+        ],
+        AttributeDefinitions=[
+            {'AttributeName': 'userId', 'AttributeType': 'S'},
+            {'AttributeName': 'id', 'AttributeType': 'S'},
+            {'AttributeName': 'date', 'AttributeType': 'S'}
+        ],
+        GlobalSecondaryIndexes=[{
+            'IndexName': 'DateIndex',
+            'KeySchema': [
+                {'AttributeName': 'userId', 'KeyType': 'HASH'},
+                {'AttributeName': 'date', 'KeyType': 'RANGE'}
+            ],
+            'Projection': {'ProjectionType': 'ALL'}
+        }],
+        BillingMode='PAY_PER_REQUEST'
+    )
+    for table in (profiles_table, transactions_table):
+        dynamodb.get_waiter('table_exists').wait(TableName=table)
+
+def seed(dynamodb, profiles_table, transactions_table, users, transactions_per_user):
+    user_ids = [f'bench-user-{i}' for i in range(users)]
+    requests = {profiles_table: [], transactions_table: []}
+    start_day = date(2024, 1, 1)
+
+    for user_id in user_ids:
+        requests[profiles_table].append({'PutRequest': {'Item': {
+            'userId': {'S': user_id},
+            'email': {'S': f'{user_id}@example.com'},
+            'preferences': {'M': {'currency': {'S': 'USD'}}}
+        }}})
+        for i in range(transactions_per_user):
+            requests[transactions_table].append({'PutRequest': {'Item': {
+                'userId': {'S': user_id},
+                'id': {'S': str(uuid.uuid4())},
+                'date': {'S': (start_day + timedelta(days=i)).isoformat()},
+                'amountMinor': {'N': str(100 + i)},
+                'currencyExponent': {'N': '2'},
+                'currency': {'S': 'USD'},
+                'type': {'S': 'debit'},
+                'category': {'S': 'Food'},
+                'description': {'S': 'Benchmark transaction'}
+            }}})
+
+    for table, items in requests.items():
+        for start in range(0, len(items), 25):
+            pending = {table: items[start:start + 25]}
+            while pending:
+                pending = dynamodb.batch_write_item(RequestItems=pending).get('UnprocessedItems')
+
+    return user_ids
+
+def run_loop(dynamodb, profiles_table, transactions_table, user_ids, since):
+    """
+    Baseline: one GetItem and one Query per user, sequentially.
+    """
+    for user_id in user_ids:
+        item = dynamodb.get_item(TableName=profiles_table, Key={'userId': {'S': user_id}}).get('Item')
+        if item:
+            deserialize_from_dynamodb(item)
+        query_user_transactions(dynamodb, transactions_table, user_id, since)
+
+def run_batch(dynamodb, query_client, profiles_table, transactions_table, user_ids, since, concurrency):
+    batch_get_profiles(dynamodb, profiles_table, user_ids)
+    _, errors = fetch_transactions_for_users(
+        query_client, transactions_table, user_ids, since=since, max_workers=concurrency
+    )
+    if errors:
+        raise RuntimeError(f'{len(errors)} transaction queries failed, e.g. {next(iter(errors.values()))}')
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark batch reads against the per-user loop')
+    parser.add_argument('--endpoint-url', default=os.environ.get('DYNAMODB_ENDPOINT_URL', 'http://localhost:8000'))
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--transactions-per-user', type=int, default=20)
+    parser.add_argument('--since', default='2024-01-05')
+    parser.add_argument('--concurrency', type=int, default=32)
+    args = parser.parse_args()
+
+    # Credentials are required by botocore but ignored by DynamoDB Local
+    os.environ.setdefault('AWS_ACCESS_KEY_ID', 'local')
+    os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'local')
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+    dynamodb = create_client(args.concurrency, args.endpoint_url)
+    query_client = create_client(args.concurrency, args.endpoint_url, max_attempts=1)
+    suffix = uuid.uuid4().hex[:8]
+    profiles_table = f'BenchUserSettings-{suffix}'
+    transactions_table = f'BenchTransactions-{suffix}'
+
+    create_tables(dynamodb, profiles_table, transactions_table)
+    try:
+        print(f"Seeding {args.users} users x {args.transactions_per_user} transactions...")
+        user_ids = seed(dynamodb, profiles_table, transactions_table, args.users, args.transactions_per_user)
+
+        started = time.perf_counter()
+        run_loop(dynamodb, profiles_table, transactions_table, user_ids, args.since)
+        loop_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        run_batch(dynamodb, query_client, profiles_table, transactions_table, user_ids, args.since, args.concurrency)
+        batch_seconds = time.perf_counter() - started
+
+        print(f"Per-user loop: {loop_seconds:.2f}s")
+        print(f"Batch reads:   {batch_seconds:.2f}s (concurrency {args.concurrency})")
+        print(f"Speedup:       {loop_seconds / batch_seconds:.1f}x")
+    finally:
+        for table in (profiles_table, transactions_table):
+            dynamodb.delete_table(TableName=table)
+
+if __name__ == '__main__':
+    main()
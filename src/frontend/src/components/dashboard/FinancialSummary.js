@@ -67,9 +67,11 @@ const ArrowDown = () => (
  * Component for displaying financial summary metrics
  * @param {Object} props - Component props
  * @param {Array} props.transactions - Array of transaction objects
+ * @param {Object} props.balances - Running balance per currency from the balance API;
+ *   when missing (mock mode), the balance is summed from the transactions
  * @returns {React.ReactElement} FinancialSummary component
  */
-const FinancialSummary = ({ transactions = [] }) => {
+const FinancialSummary = ({ transactions = [], balances = null }) => {
   const summary = useMemo(() => {
     // Default values to prevent NaN
     const defaultSummary = {
@@ -183,9 +185,18 @@ const FinancialSummary = ({ transactions = [] }) => {
     <SummaryContainer>
       <SummaryCard>
         <SummaryTitle>Total Balance</SummaryTitle>
-        <SummaryValue color={summary.totalBalance >= 0 ? '#28a745' : '#dc3545'}>
-          {formatCurrency(summary.totalBalance)}
-        </SummaryValue>
+        {balances && Object.keys(balances).length > 0 ? (
+          // Balances are kept per currency and never added across currencies
+          Object.entries(balances).map(([currency, balance]) => (
+            <SummaryValue key={currency} color={balance >= 0 ? '#28a745' : '#dc3545'}>
+              {formatCurrency(balance, currency)}
+            </SummaryValue>
+          ))
+        ) : (
+          <SummaryValue color={summary.totalBalance >= 0 ? '#28a745' : '#dc3545'}>
+            {formatCurrency(summary.totalBalance)}
+          </SummaryValue>
+        )}
       </SummaryCard>
 
       <SummaryCard>
@@ -1,6 +1,6 @@
 import React, { useEffect, useState } from 'react';
 import styled from 'styled-components';
-import { getTransactions } from '../services/api';
+import { getTransactions, getBalance } from '../services/api';
 import TransactionList from '../components/dashboard/TransactionList';
 import MarketTrends from '../components/dashboard/MarketTrends';
 import FinancialSummary from '../components/dashboard/FinancialSummary';
@@ -43,6 +43,7 @@ const ErrorMessage = styled.div`
 
 const Dashboard = () => {
   const [transactions, setTransactions] = useState([]);
+  const [balances, setBalances] = useState(null);
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState(null);
 
@@ -55,9 +56,13 @@ const Dashboard = () => {
     setError(null);
     
     try {
-      // Fetch transactions
-      const transactionsData = await getTransactions();
+      // Fetch transactions and today's running balance from the checkpoints API
+      const [transactionsData, balanceData] = await Promise.all([
+        getTransactions(),
+        getBalance()
+      ]);
       setTransactions(Array.isArray(transactionsData) ? transactionsData : []);
+      setBalances(balanceData ? balanceData.balances : null);
     } catch (err) {
       console.error('Error fetching dashboard data:', err);
       setError('Failed to load dashboard data. Please try again later.');
@@ -86,7 +91,7 @@ const Dashboard = () => {
       {error && <ErrorMessage>{error}</ErrorMessage>}
       
       <DashboardContent>
-        <FinancialSummary transactions={transactions} />
+        <FinancialSummary transactions={transactions} balances={balances} />
         <TransactionList transactions={transactions} />
         <MarketTrends />
       </DashboardContent>
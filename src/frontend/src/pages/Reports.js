@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import styled from 'styled-components';
-import { getTransactions } from '../services/api';
+import { getTransactions, getBalance } from '../services/api';
 import Card from '../components/common/Card';
 import Button from '../components/common/Button';
 import Loader from '../components/common/Loader';
@@ -219,6 +219,22 @@ const Reports = () => {
     fetchTransactions();
   }, []);
   
+  // Balance history comes from the checkpoint-backed balance API, not from the transaction list
+  const [balanceHistory, setBalanceHistory] = useState(null);
+  
+  useEffect(() => {
+    if (reportType !== 'balance') {
+      return;
+    }
+    
+    const fetchBalanceHistory = async () => {
+      const data = await getBalance({ from: startDate, to: endDate });
+      setBalanceHistory(data ? data.balances : null);
+    };
+    
+    fetchBalanceHistory();
+  }, [reportType, startDate, endDate]);
+  
   const filterTransactionsByDate = () => {
     const start = new Date(startDate);
     const end = new Date(endDate);
@@ -441,7 +457,72 @@ const Reports = () => {
     };
   };
   
+  const prepareBalanceData = () => {
+    const colors = ['#007bff', '#28a745', '#fd7e14', '#6f42c1', '#dc3545'];
+    
+    // Without the balance API (mock mode), replay the loaded transactions instead
+    let history = balanceHistory;
+    if (!history) {
+      let opening = 0;
+      const dailyNet = {};
+      transactions.forEach(transaction => {
+        const day = formatDate(transaction.date, 'yyyy-MM-dd');
+        const amount = transaction.type === 'credit' ? transaction.amount : -transaction.amount;
+        if (day < startDate) {
+          opening += amount;
+        } else if (day <= endDate) {
+          dailyNet[day] = (dailyNet[day] || 0) + amount;
+        }
+      });
+      
+      let running = opening;
+      history = {
+        USD: {
+          openingBalance: opening,
+          series: Object.keys(dailyNet).sort().map(day => {
+            running += dailyNet[day];
+            return { date: day, balance: running };
+          })
+        }
+      };
+    }
+    
+    // Series only contain days with activity; carry each balance forward to the shared days
+    const days = [...new Set(
+      Object.values(history).flatMap(currencyHistory => currencyHistory.series.map(point => point.date))
+    )].sort();
+    
+    if (days.length === 0) {
+      return { labels: [], datasets: [] };
+    }
+    
+    return {
+      labels: days.map(day => formatDate(day, 'MMM d, yyyy')),
+      datasets: Object.entries(history).map(([currency, currencyHistory], index) => {
+        const closingByDay = currencyHistory.series.reduce((acc, point) => {
+          acc[point.date] = point.balance;
+          return acc;
+        }, {});
+        let balance = currencyHistory.openingBalance;
+        
+        return {
+          label: `Balance (${currency})`,
+          data: days.map(day => {
+            if (closingByDay[day] !== undefined) {
+              balance = closingByDay[day];
+            }
+            return balance;
+          }),
+          borderColor: colors[index % colors.length],
+          borderWidth: 2,
+          tension: 0.1
+        };
+      })
+    };
+  };
+  
   const incomeExpenseData = prepareIncomeExpenseData();
+  const balanceData = reportType === 'balance' ? prepareBalanceData() : { labels: [], datasets: [] };
   const categoryData = prepareCategoryData();
   
   const exportCSV = () => {
@@ -506,6 +587,7 @@ const Reports = () => {
             <option value="income-expense">Income vs Expenses</option>
             <option value="expense-categories">Expense by Category</option>
             <option value="income-categories">Income by Category</option>
+            <option value="balance">Balance Over Time</option>
           </FilterSelect>
         </FilterGroup>
         
@@ -584,7 +666,22 @@ const Reports = () => {
       </SummaryContainer>
       
       <ReportsGrid>
-        {reportType === 'income-expense' ? (
+        {reportType === 'balance' ? (
+          <ReportCard>
+            <ReportHeader>
+              <ReportTitle>Balance Over Time</ReportTitle>
+            </ReportHeader>
+            <ChartContainer>
+              {balanceData.labels.length > 0 ? (
+                <LineChart data={balanceData} />
+              ) : (
+                <EmptyState>
+                  <div>No data available for the selected period</div>
+                </EmptyState>
+              )}
+            </ChartContainer>
+          </ReportCard>
+        ) : reportType === 'income-expense' ? (
           <>
             <ReportCard>
               <ReportHeader>
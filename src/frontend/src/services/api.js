@@ -119,6 +119,23 @@ export const getTransactions = async (options = {}) => {
   return transactions;
 };
 
+export const getBalance = async (options = {}) => {
+  // Check if we have a real API URL and we're not in mock mode
+  if (process.env.REACT_APP_API_URL && process.env.REACT_APP_USER_POOL_ID) {
+    try {
+      // options: { date } for a single day, or { from, to } for a series; optional { currency }
+      const response = await api.get('/transactions/balance', { params: options });
+      return response.data;
+    } catch (error) {
+      console.error('Error fetching balance:', error);
+      return null;
+    }
+  }
+  
+  // No mock balance data; the dashboard and reports then sum the loaded transactions
+  return null;
+};
+
 export const getMarketData = async (options = {}) => {
   // Check if we have a real API URL and we're not in mock mode
   if (process.env.REACT_APP_API_URL && process.env.REACT_APP_USER_POOL_ID) {
@@ -2,6 +2,55 @@
 Utility functions for Lambda functions.
 """
 
-from .dynamodb_utils import serialize_to_dynamodb, deserialize_from_dynamodb
+from .dynamodb_utils import (
+    serialize_to_dynamodb,
+    deserialize_from_dynamodb,
+    deserialize_transaction,
+    is_valid_currency,
+    currency_exponent,
+    to_minor_units,
+    from_minor_units,
+    read_amount_minor
+)
+from .fx_rates import load_rate_table, convert_transactions, FxRatesUnavailableError
+from .transaction_queue import get_transaction_queue, get_local_transaction_queue
+from .balance_checkpoints import (
+    write_transactions_with_balance,
+    materialize_balances,
+    is_checkpointed,
+    get_balance_on,
+    get_balance_series,
+    rebuild_checkpoints
+)
+from .idempotency import (
+    get_idempotency_key,
+    claim_idempotency_key,
+    complete_idempotency_key,
+    release_idempotency_key
+)
 
-__all__ = ['serialize_to_dynamodb', 'deserialize_from_dynamodb'] 
\ No newline at end of file
+__all__ = [
+    'serialize_to_dynamodb',
+    'deserialize_from_dynamodb',
+    'deserialize_transaction',
+    'is_valid_currency',
+    'currency_exponent',
+    'to_minor_units',
+    'from_minor_units',
+    'read_amount_minor',
+    'load_rate_table',
+    'convert_transactions',
+    'FxRatesUnavailableError',
+    'get_transaction_queue',
+    'get_local_transaction_queue',
+    'write_transactions_with_balance',
+    'materialize_balances',
+    'is_checkpointed',
+    'get_balance_on',
+    'get_balance_series',
+    'rebuild_checkpoints',
+    'get_idempotency_key',
+    'claim_idempotency_key',
+    'complete_idempotency_key',
+    'release_idempotency_key'
+] 
\ No newline at end of file
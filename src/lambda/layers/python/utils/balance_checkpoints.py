@@ -0,0 +1,453 @@
+import time
+import logging
+from datetime import date, timedelta
+
+from botocore.exceptions import ClientError
+
+from .dynamodb_utils import serialize_to_dynamodb, read_amount_minor
+from .fx_rates import DEFAULT_CURRENCY
+
+logger = logging.getLogger()
+
+# Checkpoint keys are `<currency>#<YYYY-MM-DD>`; the per-user state item uses this key
+STATE_KEY = 'STATE'
+
+# TransactWriteItems accepts at most 100 actions; each chunk of transactions
+# needs one put each plus at most one checkpoint update each
+TRANSACT_CHUNK_SIZE = 25
+MAX_TRANSACT_ATTEMPTS = 5
+MAX_REBUILD_ATTEMPTS = 5
+
+# Upper bound suffix so a day also matches full ISO timestamps on that day
+_END_OF_DAY = '~'
+
+def to_day(date_value):
+    """
+    Returns the YYYY-MM-DD day of a date or ISO timestamp string.
+    """
+    return date_value[:10]
+
+def checkpoint_key(currency, day):
+    return f'{currency}#{day}'
+
+def _previous_day(day):
+    return (date.fromisoformat(day) - timedelta(days=1)).isoformat()
+
+def transaction_currency(transaction):
+    """
+    Currency of a deserialized transaction; items without one predate currencies.
+    """
+    return (transaction.get('currency') or DEFAULT_CURRENCY).upper()
+
+def transaction_delta_minor(transaction):
+    """
+    Signed balance change of a deserialized transaction in the minor units of
+    its own currency: credits add, everything else subtracts.
+    """
+    amount = transaction['amountMinor']
+    return amount if transaction.get('type') == 'credit' else -amount
+
+def _raw_transaction_balance_change(item):
+    """
+    (currency, day, signed minor units) of a raw DynamoDB transaction item.
+    """
+    amount_minor, _ = read_amount_minor(item)
+    currency = item.get('currency', {}).get('S', DEFAULT_CURRENCY).upper()
+    delta = amount_minor if item.get('type', {}).get('S') == 'credit' else -amount_minor
+    return currency, to_day(item['date']['S']), delta
+
+def _query_all(dynamodb, **kwargs):
+    """
+    Runs a DynamoDB query and follows pagination.
+    """
+    while True:
+        response = dynamodb.query(**kwargs)
+        yield from response.get('Items', [])
+        if 'LastEvaluatedKey' not in response:
+            return
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def _cancellation_codes(error):
+    return [reason.get('Code', 'None') for reason in error.response.get('CancellationReasons', [])]
+
+def write_transactions_with_balance(dynamodb, transactions_table, checkpoints_table, transactions):
+    """
+    Writes transactions and their checkpoint deltas in one TransactWriteItems
+    call per chunk. Each transaction is only put if its ID is new, so a
+    transaction row exists exactly when its delta has been applied; retries and
+    redelivered messages cannot apply a delta twice. The user's currency set on
+    the state item is updated separately beforehand: adding to a string set is
+    idempotent, and keeping it out of the transaction means only writes to the
+    same user and day can conflict.
+
+    Args:
+        dynamodb (object): DynamoDB client
+        transactions_table (str): Transactions table name
+        checkpoints_table (str): Balance checkpoints table name
+        transactions (list): Transactions with `amountMinor`, `currency`, `date` and `type`
+
+    Returns:
+        set: (userId, id) keys that already existed and were not written again
+    """
+    existing = set()
+
+    currencies = {}
+    for transaction in transactions:
+        currencies.setdefault(transaction['userId'], set()).add(transaction_currency(transaction))
+    for user_id, user_currencies in currencies.items():
+        dynamodb.update_item(
+            TableName=checkpoints_table,
+            Key={'userId': {'S': user_id}, 'checkpointKey': {'S': STATE_KEY}},
+            UpdateExpression='ADD currencies :currencies',
+            ExpressionAttributeValues={':currencies': {'SS': sorted(user_currencies)}}
+        )
+
+    for start in range(0, len(transactions), TRANSACT_CHUNK_SIZE):
+        pending = transactions[start:start + TRANSACT_CHUNK_SIZE]
+
+        # Attempts that only drop already-written duplicates do not count towards the limit
+        failed_attempts = 0
+        while pending and failed_attempts < MAX_TRANSACT_ATTEMPTS:
+            actions = [
+                {'Put': {
+                    'TableName': transactions_table,
+                    'Item': serialize_to_dynamodb(transaction),
+                    'ConditionExpression': 'attribute_not_exists(id)'
+                }}
+                for transaction in pending
+            ]
+
+            # One update per checkpoint; an item may appear only once per call
+            deltas = {}
+            for transaction in pending:
+                key = (
+                    transaction['userId'],
+                    checkpoint_key(transaction_currency(transaction), to_day(transaction['date']))
+                )
+                deltas[key] = deltas.get(key, 0) + transaction_delta_minor(transaction)
+
+            for (user_id, key), delta_minor in deltas.items():
+                currency, day = key.split('#', 1)
+                actions.append({'Update': {
+                    'TableName': checkpoints_table,
+                    'Key': {'userId': {'S': user_id}, 'checkpointKey': {'S': key}},
+                    'UpdateExpression': 'SET currency = :currency, #day = :day ADD dayNetMinor :delta',
+                    'ExpressionAttributeNames': {'#day': 'day'},
+                    'ExpressionAttributeValues': {
+                        ':currency': {'S': currency},
+                        ':day': {'S': day},
+                        ':delta': {'N': str(delta_minor)}
+                    }
+                }})
+
+            try:
+                dynamodb.transact_write_items(TransactItems=actions)
+                pending = []
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'TransactionCanceledException':
+                    raise
+                codes = _cancellation_codes(e)
+
+                # Transactions that already exist were applied by an earlier attempt
+                duplicates = {
+                    index for index, code in enumerate(codes[:len(pending)])
+                    if code == 'ConditionalCheckFailed'
+                }
+                if duplicates:
+                    existing.update((pending[i]['userId'], pending[i]['id']) for i in duplicates)
+                    pending = [t for i, t in enumerate(pending) if i not in duplicates]
+                else:
+                    # Conflicts with concurrent writers or throttling: back off and retry
+                    logger.warning(f"Transaction write cancelled ({codes}), retry {failed_attempts + 1}")
+                    time.sleep(min(0.05 * (2 ** failed_attempts), 1.0))
+                    failed_attempts += 1
+        if pending:
+            raise RuntimeError(f'Could not write {len(pending)} transactions after {MAX_TRANSACT_ATTEMPTS} attempts')
+
+    return existing
+
+def _get_state(dynamodb, checkpoints_table, user_id, consistent=False):
+    response = dynamodb.get_item(
+        TableName=checkpoints_table,
+        Key={'userId': {'S': user_id}, 'checkpointKey': {'S': STATE_KEY}},
+        ConsistentRead=consistent
+    )
+    item = response.get('Item', {})
+    return {
+        'checkpointed': item.get('checkpointed', {}).get('BOOL', False),
+        'currencies': set(item.get('currencies', {}).get('SS', []))
+    }
+
+def _day_items(dynamodb, checkpoints_table, user_id, currency, start_day, end_day, descending=False, page_size=None):
+    kwargs = {
+        'TableName': checkpoints_table,
+        'KeyConditionExpression': 'userId = :userId AND checkpointKey BETWEEN :start AND :end',
+        'ExpressionAttributeValues': {
+            ':userId': {'S': user_id},
+            ':start': {'S': checkpoint_key(currency, start_day)},
+            ':end': {'S': checkpoint_key(currency, end_day)}
+        },
+        'ScanIndexForward': not descending,
+        'ConsistentRead': True
+    }
+    if page_size:
+        kwargs['Limit'] = page_size
+    for item in _query_all(dynamodb, **kwargs):
+        yield {
+            'day': item['day']['S'],
+            'dayNetMinor': int(item.get('dayNetMinor', {}).get('N', '0')),
+            'closingMinor': int(item['closingMinor']['N']) if 'closingMinor' in item else None,
+            'closingNetMinor': int(item.get('closingNetMinor', {}).get('N', '0'))
+        }
+
+def is_checkpointed(dynamodb, checkpoints_table, user_id):
+    """
+    Whether the user's checkpoints have been rebuilt from their full history.
+    """
+    return _get_state(dynamodb, checkpoints_table, user_id, consistent=True)['checkpointed']
+
+def _set_closing(dynamodb, checkpoints_table, user_id, currency, day, closing_minor, net_minor):
+    """
+    Stores a materialized closing balance, unless the day's net changed since it was read.
+    """
+    try:
+        dynamodb.update_item(
+            TableName=checkpoints_table,
+            Key={'userId': {'S': user_id}, 'checkpointKey': {'S': checkpoint_key(currency, day)}},
+            UpdateExpression='SET closingMinor = :closing, closingNetMinor = :net',
+            ConditionExpression='dayNetMinor = :net',
+            ExpressionAttributeValues={
+                ':closing': {'N': str(closing_minor)},
+                ':net': {'N': str(net_minor)}
+            }
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+        # A newer write changed this day; its own stream record recomputes from here
+        logger.info(f"Checkpoint {currency}#{day} for {user_id} changed during materialization")
+
+def materialize_balances(dynamodb, checkpoints_table, transactions_table, user_id, currency, from_day):
+    """
+    Recomputes closing balances of one currency from `from_day` onwards as the
+    running sum of daily nets. Runs off the request path (from the checkpoints
+    table stream), sets absolute values so redelivered records are harmless,
+    and rebuilds users whose history predates checkpoints.
+    """
+    if not is_checkpointed(dynamodb, checkpoints_table, user_id):
+        rebuild_checkpoints(dynamodb, checkpoints_table, transactions_table, user_id)
+        return
+
+    # Closing before from_day: the previous checkpoint with its current net applied
+    opening = 0
+    for item in _day_items(dynamodb, checkpoints_table, user_id, currency,
+                           '0000-00-00', _previous_day(from_day), descending=True, page_size=10):
+        opening += item['dayNetMinor'] - item['closingNetMinor']
+        if item['closingMinor'] is not None:
+            opening += item['closingMinor']
+            break
+        opening += item['closingNetMinor']
+
+    running = opening
+    updated = 0
+    for item in _day_items(dynamodb, checkpoints_table, user_id, currency, from_day, '9999-99-99'):
+        running += item['dayNetMinor']
+        if item['closingMinor'] != running or item['closingNetMinor'] != item['dayNetMinor']:
+            _set_closing(dynamodb, checkpoints_table, user_id, currency, item['day'], running, item['dayNetMinor'])
+            updated += 1
+
+    logger.info(f"Materialized {updated} {currency} checkpoints for {user_id} from {from_day}")
+
+def rebuild_checkpoints(dynamodb, checkpoints_table, transactions_table, user_id):
+    """
+    Replays all of a user's transactions and rewrites their checkpoints, then
+    marks the user as checkpointed. Until then reads replay the full history.
+    Each checkpoint update is conditional on the net observed before the
+    replay, so a transaction written concurrently restarts the rebuild.
+
+    Returns:
+        int: Number of checkpoints written
+    """
+    for attempt in range(MAX_REBUILD_ATTEMPTS):
+        # 1. Nets as they are before the replay
+        observed = {}
+        for item in _query_all(
+            dynamodb,
+            TableName=checkpoints_table,
+            KeyConditionExpression='userId = :userId',
+            ExpressionAttributeValues={':userId': {'S': user_id}},
+            ConsistentRead=True
+        ):
+            if item['checkpointKey']['S'] != STATE_KEY:
+                observed[item['checkpointKey']['S']] = item.get('dayNetMinor', {}).get('N')
+
+        # 2. Replay with a strongly consistent base-table query (GSIs can lag)
+        computed = {}
+        for item in _query_all(
+            dynamodb,
+            TableName=transactions_table,
+            KeyConditionExpression='userId = :userId',
+            ExpressionAttributeNames={'#date': 'date', '#type': 'type'},
+            ExpressionAttributeValues={':userId': {'S': user_id}},
+            ProjectionExpression='#date, #type, amount, amountMinor, currencyExponent, currency',
+            ConsistentRead=True
+        ):
+            currency, day, delta = _raw_transaction_balance_change(item)
+            key = checkpoint_key(currency, day)
+            computed[key] = computed.get(key, 0) + delta
+
+        for key in observed:
+            computed.setdefault(key, 0)
+
+        # 3. Write nets and closings, provided no write touched a day meanwhile
+        closings = {}
+        try:
+            for key in sorted(computed):
+                currency, day = key.split('#', 1)
+                closings[currency] = closings.get(currency, 0) + computed[key]
+                values = {
+                    ':net': {'N': str(computed[key])},
+                    ':closing': {'N': str(closings[currency])},
+                    ':currency': {'S': currency},
+                    ':day': {'S': day}
+                }
+                if observed.get(key) is None:
+                    condition = 'attribute_not_exists(dayNetMinor)'
+                else:
+                    condition = 'dayNetMinor = :observed'
+                    values[':observed'] = {'N': observed[key]}
+                dynamodb.update_item(
+                    TableName=checkpoints_table,
+                    Key={'userId': {'S': user_id}, 'checkpointKey': {'S': key}},
+                    UpdateExpression=(
+                        'SET dayNetMinor = :net, closingMinor = :closing, '
+                        'closingNetMinor = :net, currency = :currency, #day = :day'
+                    ),
+                    ConditionExpression=condition,
+                    ExpressionAttributeNames={'#day': 'day'},
+                    ExpressionAttributeValues=values
+                )
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            logger.info(f"Transactions changed during rebuild for {user_id}, retry {attempt + 1}")
+            continue
+
+        update = 'SET checkpointed = :true'
+        values = {':true': {'BOOL': True}}
+        if closings:
+            update += ' ADD currencies :currencies'
+            values[':currencies'] = {'SS': sorted(closings)}
+        dynamodb.update_item(
+            TableName=checkpoints_table,
+            Key={'userId': {'S': user_id}, 'checkpointKey': {'S': STATE_KEY}},
+            UpdateExpression=update,
+            ExpressionAttributeValues=values
+        )
+        logger.info(f"Rebuilt {len(computed)} checkpoints for {user_id}")
+        return len(computed)
+
+    raise RuntimeError(f'Checkpoint rebuild for {user_id} kept conflicting with new transactions')
+
+def _replay_day_nets(dynamodb, transactions_table, user_id, end_day, currency=None):
+    """
+    Per-currency, per-day nets of all transactions up to `end_day`, read through
+    the DateIndex GSI. Used for users whose checkpoints are not built yet.
+    With `currency`, only that currency's transactions are returned.
+    """
+    kwargs = {
+        'TableName': transactions_table,
+        'IndexName': 'DateIndex',
+        'KeyConditionExpression': 'userId = :userId AND #date <= :end',
+        'ExpressionAttributeNames': {'#date': 'date', '#type': 'type'},
+        'ExpressionAttributeValues': {
+            ':userId': {'S': user_id},
+            ':end': {'S': end_day + _END_OF_DAY}
+        },
+        'ProjectionExpression': '#date, #type, amount, amountMinor, currencyExponent, currency'
+    }
+    if currency:
+        # Items without a currency predate currencies and count as the default one
+        kwargs['FilterExpression'] = 'currency = :currency'
+        if currency == DEFAULT_CURRENCY:
+            kwargs['FilterExpression'] += ' OR attribute_not_exists(currency)'
+        kwargs['ExpressionAttributeValues'][':currency'] = {'S': currency}
+
+    nets = {}
+    for item in _query_all(dynamodb, **kwargs):
+        item_currency, day, delta = _raw_transaction_balance_change(item)
+        day_nets = nets.setdefault(item_currency, {})
+        day_nets[day] = day_nets.get(day, 0) + delta
+    return nets
+
+def _checkpoint_balance_on(dynamodb, checkpoints_table, user_id, currency, day):
+    """
+    Closing balance of one currency on `day`: the latest materialized
+    checkpoint plus the nets of any newer checkpoints not materialized yet.
+    A back-dated change before that checkpoint shows up once the stream
+    materializer has processed it.
+    """
+    balance = 0
+    for item in _day_items(dynamodb, checkpoints_table, user_id, currency,
+                           '0000-00-00', day, descending=True, page_size=10):
+        balance += item['dayNetMinor']
+        if item['closingMinor'] is not None:
+            return balance + item['closingMinor'] - item['closingNetMinor']
+    return balance
+
+def get_balance_on(dynamodb, checkpoints_table, transactions_table, user_id, day, currency=None):
+    """
+    Returns the user's closing balance on `day` per currency, in each
+    currency's own minor units.
+
+    Returns:
+        dict: {currency: balance_minor}
+    """
+    state = _get_state(dynamodb, checkpoints_table, user_id)
+
+    if not state['checkpointed']:
+        nets = _replay_day_nets(dynamodb, transactions_table, user_id, day, currency)
+        balances = {c: sum(day_nets.values()) for c, day_nets in nets.items()}
+    else:
+        balances = {
+            c: _checkpoint_balance_on(dynamodb, checkpoints_table, user_id, c, day)
+            for c in ([currency] if currency else state['currencies'])
+        }
+
+    if currency:
+        return {currency: balances.get(currency, 0)}
+    return balances
+
+def get_balance_series(dynamodb, checkpoints_table, transactions_table, user_id, start_day, end_day, currency=None):
+    """
+    Returns, per currency, the opening balance before `start_day` and the
+    closing balance of every day with activity in [start_day, end_day].
+
+    Returns:
+        dict: {currency: (opening_minor, [(day, closing_minor), ...])}
+    """
+    state = _get_state(dynamodb, checkpoints_table, user_id)
+    series = {}
+
+    if not state['checkpointed']:
+        for c, day_nets in _replay_day_nets(dynamodb, transactions_table, user_id, end_day, currency).items():
+            opening = sum(net for day, net in day_nets.items() if day < start_day)
+            running = opening
+            points = []
+            for day in sorted(d for d in day_nets if d >= start_day):
+                running += day_nets[day]
+                points.append((day, running))
+            series[c] = (opening, points)
+    else:
+        for c in ([currency] if currency else state['currencies']):
+            opening = _checkpoint_balance_on(dynamodb, checkpoints_table, user_id, c, _previous_day(start_day))
+            running = opening
+            points = []
+            for item in _day_items(dynamodb, checkpoints_table, user_id, c, start_day, end_day):
+                running += item['dayNetMinor']
+                points.append((item['day'], running))
+            series[c] = (opening, points)
+
+    if currency:
+        return {currency: series.get(currency, (0, []))}
+    return series
@@ -0,0 +1,293 @@
+"""
+Batch read helpers for admin, support and reporting jobs that need profiles
+and recent transactions for many users at once.
+
+Run as a CLI from the layer directory:
+
+    python -m utils.batch_reads --user-ids-file users.txt --since 2024-01-01
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError, ConnectionError as BotoConnectionError, HTTPClientError
+
+from .dynamodb_utils import deserialize_from_dynamodb, deserialize_transaction
+
+logger = logging.getLogger()
+
+# BatchGetItem accepts at most 100 keys per call
+BATCH_GET_LIMIT = 100
+MAX_ATTEMPTS = 8
+
+THROTTLING_ERRORS = (
+    'ProvisionedThroughputExceededException',
+    'ThrottlingException',
+    'RequestLimitExceeded'
+)
+
+# Server-side errors worth retrying; they say nothing about the request rate
+TRANSIENT_ERRORS = (
+    'InternalServerError',
+    'ServiceUnavailable'
+)
+
+def _is_transient(error):
+    """
+    Whether an error from a single-attempt client is worth retrying:
+    5xx responses and dropped or timed-out connections.
+    """
+    if isinstance(error, (BotoConnectionError, HTTPClientError)):
+        return True
+    if isinstance(error, ClientError):
+        return (
+            error.response['Error']['Code'] in TRANSIENT_ERRORS
+            or error.response.get('ResponseMetadata', {}).get('HTTPStatusCode', 0) >= 500
+        )
+    return False
+
+def _backoff(attempt, base=0.05, cap=2.0):
+    """
+    Sleeps with capped exponential backoff and full jitter.
+    """
+    time.sleep(random.uniform(0, min(cap, base * (2 ** attempt))))
+
+def create_client(max_workers=32, endpoint_url=None, max_attempts=None):
+    """
+    Creates a DynamoDB client sized for `max_workers` concurrent requests.
+    `endpoint_url` points the client at a local stand-in such as DynamoDB Local.
+    `max_attempts` caps the total attempts per request, including the first;
+    `max_attempts=1` disables SDK retries so throttling reaches the caller,
+    as fetch_transactions_for_users needs for its AdaptiveLimiter.
+    """
+    retries = {'mode': 'standard'}
+    if max_attempts is not None:
+        retries['total_max_attempts'] = max_attempts
+    return boto3.client(
+        'dynamodb',
+        endpoint_url=endpoint_url,
+        config=Config(max_pool_connections=max_workers, retries=retries)
+    )
+
+def batch_get_profiles(dynamodb, table_name, user_ids):
+    """
+    Fetches user profiles with chunked BatchGetItem, retrying unprocessed keys.
+
+    Args:
+        dynamodb (object): DynamoDB client
+        table_name (str): User settings table name
+        user_ids (list): User IDs to fetch
+
+    Returns:
+        dict: Profiles keyed by user ID; users without a profile are omitted
+    """
+    unique_ids = list(dict.fromkeys(user_ids))
+    profiles = {}
+
+    for start in range(0, len(unique_ids), BATCH_GET_LIMIT):
+        request = {
+            table_name: {
+                'Keys': [{'userId': {'S': user_id}} for user_id in unique_ids[start:start + BATCH_GET_LIMIT]]
+            }
+        }
+
+        for attempt in range(MAX_ATTEMPTS):
+            response = dynamodb.batch_get_item(RequestItems=request)
+            for item in response.get('Responses', {}).get(table_name, []):
+                profile = deserialize_from_dynamodb(item)
+                profiles[profile['userId']] = profile
+
+            request = response.get('UnprocessedKeys') or {}
+            if not request:
+                break
+            logger.warning(f"{len(request[table_name]['Keys'])} unprocessed keys, retry {attempt + 1}")
+            _backoff(attempt)
+        else:
+            raise RuntimeError(f'BatchGetItem still had unprocessed keys after {MAX_ATTEMPTS} attempts')
+
+    return profiles
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit that halves on throttling and grows back by one after a
+    run of successful requests (additive increase, multiplicative decrease).
+    """
+
+    def __init__(self, initial, maximum, increase_after=10):
+        self.limit = initial
+        self.maximum = maximum
+        self.increase_after = increase_after
+        self.active = 0
+        self.successes = 0
+        self.condition = threading.Condition()
+
+    def acquire(self):
+        with self.condition:
+            while self.active >= self.limit:
+                self.condition.wait()
+            self.active += 1
+
+    def release(self, throttled=False, succeeded=True):
+        """
+        Frees a slot; throttling halves the limit, and only successful
+        requests count towards growing it again.
+        """
+        with self.condition:
+            self.active -= 1
+            if throttled:
+                self.limit = max(1, self.limit // 2)
+                self.successes = 0
+            elif succeeded:
+                self.successes += 1
+                if self.successes >= self.increase_after and self.limit < self.maximum:
+                    self.limit += 1
+                    self.successes = 0
+            self.condition.notify_all()
+
+def query_user_transactions(dynamodb, table_name, user_id, since=None, limit=None):
+    """
+    Queries one user's transactions, newest first, through the DateIndex GSI.
+
+    Args:
+        dynamodb (object): DynamoDB client
+        table_name (str): Transactions table name
+        user_id (str): User ID
+        since (str): Only return transactions on or after this date (YYYY-MM-DD)
+        limit (int): Maximum number of transactions to return
+
+    Returns:
+        list: Deserialized transactions
+    """
+    kwargs = {
+        'TableName': table_name,
+        'IndexName': 'DateIndex',
+        'KeyConditionExpression': 'userId = :userId',
+        'ExpressionAttributeValues': {':userId': {'S': user_id}},
+        'ScanIndexForward': False
+    }
+    if since:
+        kwargs['KeyConditionExpression'] += ' AND #date >= :since'
+        kwargs['ExpressionAttributeNames'] = {'#date': 'date'}
+        kwargs['ExpressionAttributeValues'][':since'] = {'S': since}
+    if limit:
+        kwargs['Limit'] = limit
+
+    transactions = []
+    while True:
+        response = dynamodb.query(**kwargs)
+        transactions.extend(deserialize_transaction(item) for item in response.get('Items', []))
+        if 'LastEvaluatedKey' not in response or (limit and len(transactions) >= limit):
+            break
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    return transactions[:limit] if limit else transactions
+
+def fetch_transactions_for_users(dynamodb, table_name, user_ids, since=None, limit=None,
+                                 max_workers=32, initial_concurrency=8):
+    """
+    Queries transactions for many users concurrently on a bounded thread pool.
+    Concurrency adapts to throttling: throttled queries are retried with backoff
+    and halve the number of in-flight queries. Server errors and dropped
+    connections are retried with backoff without reducing concurrency.
+    Pass a client created with `max_attempts=1` so throttling is not hidden
+    by SDK retries.
+    A user whose query fails does not stop the others.
+
+    Returns:
+        tuple: (transactions keyed by user ID, error messages keyed by user ID)
+    """
+    limiter = AdaptiveLimiter(min(initial_concurrency, max_workers), max_workers)
+
+    def fetch(user_id):
+        last_error = None
+        for attempt in range(MAX_ATTEMPTS):
+            limiter.acquire()
+            try:
+                transactions = query_user_transactions(dynamodb, table_name, user_id, since, limit)
+            except Exception as e:
+                throttled = isinstance(e, ClientError) and e.response['Error']['Code'] in THROTTLING_ERRORS
+                limiter.release(throttled=throttled, succeeded=False)
+                if not throttled and not _is_transient(e):
+                    return None, str(e)
+                last_error = e
+                _backoff(attempt)
+                continue
+            limiter.release()
+            return transactions, None
+        return None, f'Transactions query failed {MAX_ATTEMPTS} times: {last_error}'
+
+    unique_ids = list(dict.fromkeys(user_ids))
+    results = {}
+    errors = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for user_id, (transactions, error) in zip(unique_ids, executor.map(fetch, unique_ids)):
+            if error:
+                logger.error(f"Failed to fetch transactions for {user_id}: {error}")
+                errors[user_id] = error
+            else:
+                results[user_id] = transactions
+    return results, errors
+
+def main(argv=None):
+    """
+    CLI entry point: prints one JSON line per user with their profile and
+    recent transactions, or an `error` if their transactions could not be read.
+    Exits with status 1 if any user failed.
+    """
+    parser = argparse.ArgumentParser(description='Fetch profiles and recent transactions for many users')
+    parser.add_argument('--user-ids-file', default='-', help='File with one user ID per line (default: stdin)')
+    parser.add_argument('--since', help='Only include transactions on or after this date (YYYY-MM-DD)')
+    parser.add_argument('--limit', type=int, help='Maximum transactions per user')
+    parser.add_argument('--concurrency', type=int, default=32, help='Maximum concurrent transaction queries')
+    parser.add_argument('--no-transactions', action='store_true', help='Only fetch profiles')
+    parser.add_argument('--endpoint-url', default=os.environ.get('DYNAMODB_ENDPOINT_URL'),
+                        help='DynamoDB endpoint, e.g. http://localhost:8000 for DynamoDB Local')
+    parser.add_argument('--user-settings-table', default=os.environ.get('USER_SETTINGS_TABLE', 'UserSettings'))
+    parser.add_argument('--transactions-table', default=os.environ.get('TRANSACTIONS_TABLE', 'Transactions'))
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.user_ids_file == '-' else open(args.user_ids_file)
+    with source:
+        user_ids = [line.strip() for line in source if line.strip()]
+
+    started = time.perf_counter()
+
+    # Profiles rely on SDK retries; transaction queries leave throttling to the limiter
+    profiles = batch_get_profiles(
+        create_client(args.concurrency, args.endpoint_url), args.user_settings_table, user_ids
+    )
+    transactions = {}
+    errors = {}
+    if not args.no_transactions:
+        transactions, errors = fetch_transactions_for_users(
+            create_client(args.concurrency, args.endpoint_url, max_attempts=1),
+            args.transactions_table, user_ids,
+            since=args.since, limit=args.limit, max_workers=args.concurrency
+        )
+
+    for user_id in dict.fromkeys(user_ids):
+        record = {'userId': user_id, 'profile': profiles.get(user_id)}
+        if user_id in errors:
+            record['error'] = errors[user_id]
+        elif not args.no_transactions:
+            record['transactions'] = transactions.get(user_id, [])
+        print(json.dumps(record))
+
+    print(
+        f"Fetched {len(user_ids)} users in {time.perf_counter() - started:.2f}s, {len(errors)} failed",
+        file=sys.stderr
+    )
+    if errors:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -4,6 +4,29 @@ from boto3.dynamodb.types import TypeSerializer, TypeDeserializer
 serializer = TypeSerializer()
 deserializer = TypeDeserializer()
 
+# Number of minor-unit digits per currency (ISO 4217); anything else uses 2
+CURRENCY_EXPONENTS = {
+    'BHD': 3, 'CLP': 0, 'ISK': 0, 'JOD': 3, 'JPY': 0, 'KRW': 0,
+    'KWD': 3, 'OMR': 3, 'TND': 3, 'UGX': 0, 'VND': 0, 'XAF': 0, 'XOF': 0
+}
+DEFAULT_CURRENCY_EXPONENT = 2
+
+# Active ISO 4217 currency codes accepted for transactions
+ISO_4217_CURRENCIES = frozenset('''
+    AED AFN ALL AMD ANG AOA ARS AUD AWG AZN BAM BBD BDT BGN BHD BIF BMD BND BOB
+    BRL BSD BTN BWP BYN BZD CAD CDF CHF CLP CNY COP CRC CUP CVE CZK DJF DKK DOP
+    DZD EGP ERN ETB EUR FJD FKP GBP GEL GHS GIP GMD GNF GTQ GYD HKD HNL HTG HUF
+    IDR ILS INR IQD IRR ISK JMD JOD JPY KES KGS KHR KMF KPW KRW KWD KYD KZT LAK
+    LBP LKR LRD LSL LYD MAD MDL MGA MKD MMK MNT MOP MRU MUR MVR MWK MXN MYR MZN
+    NAD NGN NIO NOK NPR NZD OMR PAB PEN PGK PHP PKR PLN PYG QAR RON RSD RUB RWF
+    SAR SBD SCR SDG SEK SGD SHP SLE SOS SRD SSP STN SYP SZL THB TJS TMT TND TOP
+    TRY TTD TWD TZS UAH UGX USD UYU UZS VES VND VUV WST XAF XCD XOF XPF YER ZAR
+    ZMW ZWL
+'''.split())
+
+# Attributes that make up the fixed-point amount of a transaction item
+AMOUNT_ATTRIBUTES = ('amount', 'amountMinor', 'currencyExponent')
+
 def serialize_to_dynamodb(data):
     """
     Recursively serializes a Python dictionary to a DynamoDB-compatible format.
@@ -38,4 +61,69 @@ def deserialize_from_dynamodb(dynamodb_data):
             return {k: _convert_decimals(v) for k, v in obj.items()}
         return obj
 
-    return _convert_decimals(deserialized_data) 
\ No newline at end of file
+    return _convert_decimals(deserialized_data) 
+
+def is_valid_currency(currency):
+    """
+    Returns True if `currency` is an active ISO 4217 code (case-insensitive).
+    """
+    return isinstance(currency, str) and currency.upper() in ISO_4217_CURRENCIES
+
+def currency_exponent(currency):
+    """
+    Returns the number of minor-unit digits for a currency code.
+    """
+    return CURRENCY_EXPONENTS.get((currency or '').upper(), DEFAULT_CURRENCY_EXPONENT)
+
+def to_minor_units(amount, exponent):
+    """
+    Converts a decimal amount (number or numeric string) to integer minor units.
+    - Goes through `Decimal(str(value))` once, at write time only
+    - Rounds half up, e.g. 10.005 USD -> 1001
+    """
+    value = decimal.Decimal(str(amount)).scaleb(exponent)
+    return int(value.quantize(decimal.Decimal(1), rounding=decimal.ROUND_HALF_UP))
+
+def from_minor_units(amount_minor, exponent):
+    """
+    Converts integer minor units back to a float for JSON responses.
+    """
+    return amount_minor / (10 ** exponent)
+
+def read_amount_minor(item):
+    """
+    Reads the fixed-point amount of a raw DynamoDB transaction item.
+    - New items store `amountMinor` and `currencyExponent` as integers
+    - Legacy items only store a decimal `amount` and are converted on the fly
+
+    Returns:
+        tuple: (amount_minor, exponent)
+    """
+    if 'amountMinor' in item:
+        exponent = item.get('currencyExponent', {}).get('N', DEFAULT_CURRENCY_EXPONENT)
+        return int(item['amountMinor']['N']), int(exponent)
+
+    exponent = currency_exponent(item.get('currency', {}).get('S'))
+    legacy_amount = item.get('amount')
+    if not legacy_amount:
+        return 0, exponent
+    try:
+        # The legacy value may be stored as either a number or a string
+        return to_minor_units(next(iter(legacy_amount.values())), exponent), exponent
+    except (decimal.InvalidOperation, TypeError, ValueError):
+        return 0, exponent
+
+def deserialize_transaction(dynamodb_data):
+    """
+    Deserializes a DynamoDB transaction item, decoding its amount as fixed point.
+    - Sets `amountMinor` / `currencyExponent` as integers
+    - Sets `amount` as a float derived from the minor units
+    """
+    amount_minor, exponent = read_amount_minor(dynamodb_data)
+    transaction = deserialize_from_dynamodb(
+        {k: v for k, v in dynamodb_data.items() if k not in AMOUNT_ATTRIBUTES}
+    )
+    transaction['amountMinor'] = amount_minor
+    transaction['currencyExponent'] = exponent
+    transaction['amount'] = from_minor_units(amount_minor, exponent)
+    return transaction
\ No newline at end of file
@@ -0,0 +1,162 @@
+import json
+import os
+import time
+import logging
+from bisect import bisect_right
+
+import boto3
+from botocore.exceptions import ClientError
+
+from .dynamodb_utils import currency_exponent, from_minor_units
+
+logger = logging.getLogger()
+
+DEFAULT_CURRENCY = 'USD'
+
+class FxRatesUnavailableError(Exception):
+    """
+    The FX rate table is not configured, cannot be loaded, or has no rate for a
+    currency. This is a server-side problem, not a bad request.
+    """
+
+# Per-container cache so warm invocations reuse the rate table
+_rate_table_cache = {
+    'table': None,
+    'loaded_at': 0.0
+}
+
+def _read_rate_table_source():
+    """
+    Read the raw FX rate table from S3 or from a local file.
+    - `FX_RATES_BUCKET` / `FX_RATES_KEY` load the table from S3
+    - `FX_RATES_FILE` loads the table from a local JSON file (tests, local runs)
+    """
+    bucket = os.environ.get('FX_RATES_BUCKET')
+    if bucket:
+        key = os.environ.get('FX_RATES_KEY', 'fx/rates.json')
+        s3 = boto3.client('s3')
+        response = s3.get_object(Bucket=bucket, Key=key)
+        return json.loads(response['Body'].read())
+
+    path = os.environ.get('FX_RATES_FILE')
+    if path:
+        with open(path) as f:
+            return json.load(f)
+
+    raise FxRatesUnavailableError('No FX rate source configured (set FX_RATES_BUCKET or FX_RATES_FILE)')
+
+def _build_rate_table(raw):
+    """
+    Normalize a raw rate table of the form
+    {"base": "USD", "rates": {"YYYY-MM-DD": {"EUR": 0.91, ...}, ...}}
+    where each rate is the number of units of a currency per one unit of base.
+    """
+    base = raw.get('base', DEFAULT_CURRENCY).upper()
+    rates = {
+        date: {currency.upper(): float(rate) for currency, rate in day_rates.items()}
+        for date, day_rates in raw.get('rates', {}).items()
+    }
+    if not rates:
+        raise FxRatesUnavailableError('FX rate table contains no rates')
+
+    return {
+        'base': base,
+        'dates': sorted(rates),
+        'rates': rates
+    }
+
+def load_rate_table(force_refresh=False):
+    """
+    Return the FX rate table, reloading it once the cached copy is older than
+    `FX_RATES_TTL_SECONDS` (default one hour).
+    """
+    ttl = float(os.environ.get('FX_RATES_TTL_SECONDS', '3600'))
+    now = time.monotonic()
+
+    if (force_refresh or _rate_table_cache['table'] is None or
+            now - _rate_table_cache['loaded_at'] > ttl):
+        logger.info("Loading FX rate table")
+        try:
+            raw = _read_rate_table_source()
+        except (ClientError, OSError, ValueError) as e:
+            raise FxRatesUnavailableError(f'Could not load FX rate table: {str(e)}') from e
+        _rate_table_cache['table'] = _build_rate_table(raw)
+        _rate_table_cache['loaded_at'] = now
+
+    return _rate_table_cache['table']
+
+def _rate_on(table, currency, date):
+    """
+    Units of `currency` per one unit of base on `date`, using the most recent
+    published rate on or before that date.
+    """
+    if currency == table['base']:
+        return 1.0
+
+    dates = table['dates']
+    index = max(bisect_right(dates, date) - 1, 0)
+
+    # Walk back to the latest day that actually quotes this currency
+    for day in reversed(dates[:index + 1]):
+        rate = table['rates'][day].get(currency)
+        if rate:
+            return rate
+    for day in dates[index + 1:]:
+        rate = table['rates'][day].get(currency)
+        if rate:
+            return rate
+
+    raise FxRatesUnavailableError(f'No FX rate available for currency: {currency}')
+
+def conversion_factor(table, from_currency, to_currency, date):
+    """
+    Factor that converts an amount in `from_currency` to `to_currency` on `date`.
+    """
+    if from_currency == to_currency:
+        return 1.0
+    return _rate_on(table, to_currency, date) / _rate_on(table, from_currency, date)
+
+def convert_transactions(transactions, target_currency, table=None):
+    """
+    Convert the amount of every transaction to `target_currency` in place.
+    - Groups transactions by currency and resolves each distinct date once
+    - Converts each group with a single multiply pass over its integer minor units
+    - Keeps the original values in `originalAmount` / `originalCurrency`
+    - Raises FxRatesUnavailableError if a needed rate cannot be loaded
+    """
+    target_currency = target_currency.upper()
+    target_exponent = currency_exponent(target_currency)
+
+    groups = {}
+    for transaction in transactions:
+        currency = (transaction.get('currency') or DEFAULT_CURRENCY).upper()
+        groups.setdefault(currency, []).append(transaction)
+
+    # Only load rates when some amounts are actually in another currency
+    if table is None and any(currency != target_currency for currency in groups):
+        table = load_rate_table()
+
+    for currency, group in groups.items():
+        keys = [
+            (transaction.get('date', ''), transaction.get('currencyExponent', currency_exponent(currency)))
+            for transaction in group
+        ]
+        # Fold the FX rate and the change of exponent into one factor per key
+        factors_by_key = {
+            (date, exponent): conversion_factor(table, currency, target_currency, date)
+            * 10 ** (target_exponent - exponent)
+            for date, exponent in set(keys)
+        }
+        factors = [factors_by_key[key] for key in keys]
+        amounts = [transaction.get('amountMinor', 0) for transaction in group]
+        converted = [round(amount * factor) for amount, factor in zip(amounts, factors)]
+
+        for transaction, value in zip(group, converted):
+            transaction['originalAmount'] = transaction.get('amount', 0)
+            transaction['originalCurrency'] = currency
+            transaction['amountMinor'] = value
+            transaction['currencyExponent'] = target_exponent
+            transaction['amount'] = from_minor_units(value, target_exponent)
+            transaction['currency'] = target_currency
+
+    return transactions
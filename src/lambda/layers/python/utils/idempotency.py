@@ -0,0 +1,131 @@
+import json
+import time
+import uuid
+import hashlib
+import logging
+
+from botocore.exceptions import ClientError
+
+logger = logging.getLogger()
+
+# Namespace for deriving resource IDs from idempotency keys
+IDEMPOTENCY_NAMESPACE = uuid.UUID('6f1d2a8e-3c4b-4f5e-9a7d-2b8c1e0f4d3a')
+
+STATUS_IN_PROGRESS = 'IN_PROGRESS'
+STATUS_COMPLETED = 'COMPLETED'
+
+# Attribute on a created resource holding the fingerprint of the request that created it,
+# so a retry can be checked against it even after its idempotency record is gone
+FINGERPRINT_ATTRIBUTE = 'idempotencyFingerprint'
+
+def get_idempotency_key(event):
+    """
+    Returns the `Idempotency-Key` request header, matched case-insensitively.
+    """
+    for name, value in (event.get('headers') or {}).items():
+        if name.lower() == 'idempotency-key' and value:
+            return value.strip()
+    return None
+
+def idempotency_record_key(user_id, idempotency_key):
+    """
+    Scopes an idempotency key to a user so keys cannot collide across users.
+    """
+    return f'{user_id}#{idempotency_key}'
+
+def derive_id(record_key):
+    """
+    Derives a stable resource ID from an idempotency record key, so retries of
+    the same request always target the same item.
+    """
+    return str(uuid.uuid5(IDEMPOTENCY_NAMESPACE, record_key))
+
+def request_fingerprint(body):
+    """
+    Hash of the request body, used to reject a key reused for a different request.
+    JSON bodies are hashed in canonical form, so whitespace and key order do not matter.
+    """
+    try:
+        canonical = json.dumps(json.loads(body or ''), sort_keys=True)
+    except ValueError:
+        canonical = body or ''
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def claim_idempotency_key(dynamodb, table_name, record_key, fingerprint, ttl_seconds, lock_seconds=30):
+    """
+    Claims an idempotency key with a conditional put.
+    - Succeeds if the key is new, its record has expired, or a previous attempt
+      stopped without completing for longer than `lock_seconds`
+
+    Returns:
+        dict: None if the key was claimed, otherwise the existing record
+    """
+    now = int(time.time())
+    try:
+        dynamodb.put_item(
+            TableName=table_name,
+            Item={
+                'idempotencyKey': {'S': record_key},
+                'status': {'S': STATUS_IN_PROGRESS},
+                'fingerprint': {'S': fingerprint},
+                'lockedUntil': {'N': str(now + lock_seconds)},
+                'expiresAt': {'N': str(now + ttl_seconds)}
+            },
+            ConditionExpression=(
+                'attribute_not_exists(idempotencyKey) OR expiresAt < :now OR '
+                '(#status = :inProgress AND lockedUntil < :now)'
+            ),
+            ExpressionAttributeNames={'#status': 'status'},
+            ExpressionAttributeValues={
+                ':now': {'N': str(now)},
+                ':inProgress': {'S': STATUS_IN_PROGRESS}
+            }
+        )
+        return None
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+
+    response = dynamodb.get_item(
+        TableName=table_name,
+        Key={'idempotencyKey': {'S': record_key}},
+        ConsistentRead=True
+    )
+    item = response.get('Item', {})
+    record = {
+        'status': item.get('status', {}).get('S', STATUS_IN_PROGRESS),
+        'fingerprint': item.get('fingerprint', {}).get('S')
+    }
+    if 'response' in item:
+        record['response'] = json.loads(item['response']['S'])
+    return record
+
+def complete_idempotency_key(dynamodb, table_name, record_key, response):
+    """
+    Stores the serialized response on a claimed key so replays can be answered from it.
+    """
+    dynamodb.update_item(
+        TableName=table_name,
+        Key={'idempotencyKey': {'S': record_key}},
+        UpdateExpression='SET #status = :completed, #response = :response REMOVE lockedUntil',
+        ExpressionAttributeNames={'#status': 'status', '#response': 'response'},
+        ExpressionAttributeValues={
+            ':completed': {'S': STATUS_COMPLETED},
+            ':response': {'S': json.dumps(response)}
+        }
+    )
+
+def release_idempotency_key(dynamodb, table_name, record_key):
+    """
+    Deletes an in-progress claim after a failed attempt so the client can retry.
+    """
+    try:
+        dynamodb.delete_item(
+            TableName=table_name,
+            Key={'idempotencyKey': {'S': record_key}},
+            ConditionExpression='#status = :inProgress',
+            ExpressionAttributeNames={'#status': 'status'},
+            ExpressionAttributeValues={':inProgress': {'S': STATUS_IN_PROGRESS}}
+        )
+    except ClientError as e:
+        logger.error(f"Failed to release idempotency key {record_key}: {str(e)}")
@@ -0,0 +1,135 @@
+import json
+import os
+import fcntl
+from collections import deque
+
+import boto3
+
+class SqsTransactionQueue:
+    """
+    Producer side of the Amazon SQS transaction queue.
+    Messages are consumed through the Lambda SQS event source, and failed
+    messages reach the dead-letter queue through the queue's redrive policy.
+    """
+
+    def __init__(self, queue_url):
+        self.queue_url = queue_url
+        self.sqs = boto3.client('sqs')
+
+    def send(self, message):
+        self.sqs.send_message(QueueUrl=self.queue_url, MessageBody=json.dumps(message))
+
+class InMemoryTransactionQueue:
+    """
+    Process-local transaction queue for tests and local runs. Messages are lost
+    when the process exits, so it is only used when explicitly requested.
+    """
+
+    def __init__(self):
+        self.messages = deque()
+        self.dead_letters = []
+        self._next_id = 0
+
+    def send(self, message):
+        self._next_id += 1
+        self.messages.append((str(self._next_id), message))
+
+    def receive(self, max_messages):
+        batch = []
+        while self.messages and len(batch) < max_messages:
+            batch.append(self.messages.popleft())
+        return batch
+
+    def dead_letter(self, messages):
+        self.dead_letters.extend(messages)
+
+class FileTransactionQueue:
+    """
+    Transaction queue stored as JSON lines in a local file, so producer and
+    consumer can run as separate processes. Every access holds an exclusive
+    `flock` on the file, so a message appended while the consumer rewrites the
+    file is not lost. Dead letters go to `<path>.dlq`.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.dead_letter_path = f'{path}.dlq'
+
+    @staticmethod
+    def _append(path, entries):
+        with open(path, 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.writelines(json.dumps(entry) + '\n' for entry in entries)
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def send(self, message):
+        self._append(self.path, [{'id': message.get('id'), 'body': message}])
+
+    def receive(self, max_messages):
+        # Read and rewrite under one lock so concurrent sends wait instead of being overwritten
+        with open(self.path, 'a+') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                entries = [json.loads(line) for line in f if line.strip()]
+                batch, remaining = entries[:max_messages], entries[max_messages:]
+                if batch:
+                    f.seek(0)
+                    f.truncate()
+                    f.writelines(json.dumps(entry) + '\n' for entry in remaining)
+                    f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        return [(entry['id'], entry['body']) for entry in batch]
+
+    def dead_letter(self, messages):
+        self._append(self.dead_letter_path, [
+            {'id': message_id, 'body': body} for message_id, body in messages
+        ])
+
+# Per-container queue, so the in-memory stand-in is shared by producer and consumer
+_queue_cache = {}
+
+def _local_queue(queue_file, in_memory):
+    key = (queue_file, in_memory)
+    if key not in _queue_cache:
+        if queue_file:
+            _queue_cache[key] = FileTransactionQueue(queue_file)
+        elif in_memory:
+            _queue_cache[key] = InMemoryTransactionQueue()
+    return _queue_cache.get(key)
+
+def get_transaction_queue():
+    """
+    Returns the queue that create_transaction sends to in async mode.
+    - `TRANSACTIONS_QUEUE_URL` selects SQS
+    - `TRANSACTIONS_QUEUE_FILE` selects the file-backed stand-in
+    - `TRANSACTIONS_QUEUE_IN_MEMORY=true` selects the in-memory stand-in (tests only)
+    - Raises RuntimeError if none is configured, so accepted transactions are never dropped
+    """
+    queue_url = os.environ.get('TRANSACTIONS_QUEUE_URL')
+    if queue_url:
+        if queue_url not in _queue_cache:
+            _queue_cache[queue_url] = SqsTransactionQueue(queue_url)
+        return _queue_cache[queue_url]
+
+    queue = get_local_transaction_queue()
+    if queue is None:
+        raise RuntimeError(
+            'No transaction queue configured (set TRANSACTIONS_QUEUE_URL, '
+            'TRANSACTIONS_QUEUE_FILE or TRANSACTIONS_QUEUE_IN_MEMORY=true)'
+        )
+    return queue
+
+def get_local_transaction_queue():
+    """
+    Returns the file-backed or in-memory stand-in queue that the ingest handler
+    drains when it is invoked without SQS records, or None if neither is configured.
+    """
+    return _local_queue(
+        os.environ.get('TRANSACTIONS_QUEUE_FILE'),
+        os.environ.get('TRANSACTIONS_QUEUE_IN_MEMORY', '').lower() == 'true'
+    )
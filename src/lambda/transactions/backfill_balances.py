@@ -0,0 +1,77 @@
+import os
+import boto3
+import logging
+from utils.balance_checkpoints import rebuild_checkpoints, is_checkpointed
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Stop scanning with this much time left so the response can still be returned
+MIN_REMAINING_MILLIS = 60000
+
+def lambda_handler(event, context):
+    """
+    Lambda function that rebuilds balance checkpoints from the full transaction
+    history, for users whose transactions predate checkpoints.
+    - `{"userIds": [...]}` rebuilds the given users
+    - Otherwise scans the transactions table; pass the returned `lastEvaluatedKey`
+      back in to continue where a previous invocation stopped
+    - Users that are already checkpointed are skipped unless `force` is true
+
+    Args:
+        event (dict): Backfill options
+        context (object): Lambda Context runtime methods and attributes
+
+    Returns:
+        dict: Counts of rebuilt and skipped users, and `lastEvaluatedKey` if unfinished
+    """
+    dynamodb = boto3.client('dynamodb')
+    checkpoints_table = os.environ.get('BALANCE_CHECKPOINTS_TABLE', 'BalanceCheckpoints')
+    transactions_table = os.environ.get('TRANSACTIONS_TABLE', 'Transactions')
+    force = event.get('force', False)
+
+    seen = set()
+    rebuilt = 0
+    skipped = 0
+
+    def backfill(user_id):
+        nonlocal rebuilt, skipped
+        if user_id in seen:
+            return
+        seen.add(user_id)
+        if not force and is_checkpointed(dynamodb, checkpoints_table, user_id):
+            skipped += 1
+            return
+        rebuild_checkpoints(dynamodb, checkpoints_table, transactions_table, user_id)
+        rebuilt += 1
+
+    if 'userIds' in event:
+        for user_id in event['userIds']:
+            backfill(user_id)
+        logger.info(f"Backfill finished: {rebuilt} rebuilt, {skipped} skipped")
+        return {'rebuilt': rebuilt, 'skipped': skipped}
+
+    scan_kwargs = {
+        'TableName': transactions_table,
+        'ProjectionExpression': 'userId'
+    }
+    if event.get('lastEvaluatedKey'):
+        scan_kwargs['ExclusiveStartKey'] = event['lastEvaluatedKey']
+
+    while True:
+        response = dynamodb.scan(**scan_kwargs)
+        for item in response.get('Items', []):
+            backfill(item['userId']['S'])
+
+        last_key = response.get('LastEvaluatedKey')
+        if not last_key:
+            break
+        scan_kwargs['ExclusiveStartKey'] = last_key
+
+        if context and context.get_remaining_time_in_millis() < MIN_REMAINING_MILLIS:
+            # Users at page boundaries may be seen again by the next invocation and are then skipped
+            logger.info(f"Backfill paused: {rebuilt} rebuilt, {skipped} skipped")
+            return {'rebuilt': rebuilt, 'skipped': skipped, 'lastEvaluatedKey': last_key}
+
+    logger.info(f"Backfill finished: {rebuilt} rebuilt, {skipped} skipped")
+    return {'rebuilt': rebuilt, 'skipped': skipped}
@@ -3,13 +3,109 @@ import os
 import boto3
 import logging
 import uuid
+import decimal
 from datetime import datetime, timezone
 from botocore.exceptions import ClientError
-from utils.dynamodb_utils import serialize_to_dynamodb
+from utils.dynamodb_utils import (
+    deserialize_transaction,
+    is_valid_currency,
+    currency_exponent,
+    to_minor_units,
+    from_minor_units
+)
+from utils.transaction_queue import get_transaction_queue
+from utils.balance_checkpoints import write_transactions_with_balance
+from utils.idempotency import (
+    get_idempotency_key,
+    idempotency_record_key,
+    derive_id,
+    request_fingerprint,
+    claim_idempotency_key,
+    complete_idempotency_key,
+    release_idempotency_key,
+    STATUS_COMPLETED,
+    FINGERPRINT_ATTRIBUTE
+)
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+def key_reused_response():
+    """
+    Build the response for an Idempotency-Key reused with a different request body
+    
+    Returns:
+        dict: API Gateway Lambda Proxy Output Format
+    """
+    return {
+        'statusCode': 422,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*',
+            'Access-Control-Allow-Credentials': True
+        },
+        'body': json.dumps({
+            'message': 'Idempotency-Key was already used for a different request'
+        })
+    }
+
+def replay_response(record, fingerprint):
+    """
+    Build the response for a request whose Idempotency-Key was already used
+    
+    Args:
+        record (dict): Existing idempotency record
+        fingerprint (str): Fingerprint of the current request body
+        
+    Returns:
+        dict: API Gateway Lambda Proxy Output Format
+    """
+    headers = {
+        'Content-Type': 'application/json',
+        'Access-Control-Allow-Origin': '*',
+        'Access-Control-Allow-Credentials': True
+    }
+    
+    if record['fingerprint'] != fingerprint:
+        return key_reused_response()
+    
+    if record['status'] != STATUS_COMPLETED or 'response' not in record:
+        return {
+            'statusCode': 409,
+            'headers': headers,
+            'body': json.dumps({
+                'message': 'A request with this Idempotency-Key is still in progress'
+            })
+        }
+    
+    # Answer from the stored response without writing the transaction again
+    response = record['response']
+    response['headers'] = {**response.get('headers', {}), 'Idempotent-Replayed': 'true'}
+    return response
+
+def get_stored_transaction(dynamodb, table_name, user_id, transaction_id):
+    """
+    Read back a transaction saved by an earlier attempt of the same request
+    
+    Args:
+        dynamodb (object): DynamoDB client
+        table_name (str): Transactions table name
+        user_id (str): User ID
+        transaction_id (str): Transaction ID derived from the idempotency key
+        
+    Returns:
+        dict: The stored transaction, or None if it was not saved; the request
+        fingerprint it was created with is included under FINGERPRINT_ATTRIBUTE
+    """
+    response = dynamodb.get_item(
+        TableName=table_name,
+        Key={'userId': {'S': user_id}, 'id': {'S': transaction_id}},
+        ConsistentRead=True
+    )
+    if 'Item' not in response:
+        return None
+    return deserialize_transaction(response['Item'])
+
 def lambda_handler(event, context):
     """
     Lambda function to create a new transaction.
@@ -23,6 +119,9 @@ def lambda_handler(event, context):
     """
     logger.info(f"Create transaction request received: {json.dumps(event)}")
     
+    idempotency_table = os.environ.get('IDEMPOTENCY_TABLE', 'IdempotencyKeys')
+    claimed_key = None
+    
     try:
         # Extract user ID from the Cognito authorizer
         # The authorizer adds the claims to the requestContext
@@ -65,12 +164,60 @@ def lambda_handler(event, context):
                     })
                 }
         
+        # Store the amount as integer minor units (e.g. cents) of its currency
+        currency = request_body.get('currency', 'USD')
+        if not is_valid_currency(currency):
+            return {
+                'statusCode': 400,
+                'headers': {
+                    'Content-Type': 'application/json',
+                    'Access-Control-Allow-Origin': '*',
+                    'Access-Control-Allow-Credentials': True
+                },
+                'body': json.dumps({
+                    'message': f'Unsupported currency: {currency}'
+                })
+            }
+        currency = currency.upper()
+        exponent = currency_exponent(currency)
+        try:
+            amount_minor = to_minor_units(request_body['amount'], exponent)
+        except (decimal.InvalidOperation, TypeError, ValueError):
+            return {
+                'statusCode': 400,
+                'headers': {
+                    'Content-Type': 'application/json',
+                    'Access-Control-Allow-Origin': '*',
+                    'Access-Control-Allow-Credentials': True
+                },
+                'body': json.dumps({
+                    'message': f"Invalid amount: {request_body['amount']}"
+                })
+            }
+        
         # Initialize DynamoDB client
         dynamodb = boto3.client('dynamodb')
         table_name = os.environ.get('TRANSACTIONS_TABLE', 'Transactions')
         
-        # Create transaction item
-        transaction_id = str(uuid.uuid4())
+        # With an Idempotency-Key, claim the key first and replay earlier responses
+        idempotency_key = get_idempotency_key(event)
+        if idempotency_key:
+            record_key = idempotency_record_key(user_id, idempotency_key)
+            fingerprint = request_fingerprint(event.get('body'))
+            existing = claim_idempotency_key(
+                dynamodb,
+                idempotency_table,
+                record_key,
+                fingerprint,
+                int(os.environ.get('IDEMPOTENCY_TTL_SECONDS', '86400'))
+            )
+            if existing:
+                logger.info(f"Replaying response for idempotency key {record_key}")
+                return replay_response(existing, fingerprint)
+            claimed_key = record_key
+        
+        # Create transaction item; retries with the same key get the same ID
+        transaction_id = derive_id(claimed_key) if claimed_key else str(uuid.uuid4())
         current_time = datetime.now(timezone.utc)
         timestamp = current_time.isoformat()
         
@@ -81,15 +228,22 @@ def lambda_handler(event, context):
         transaction_item = {
             'userId': user_id,
             'id': transaction_id,
-            'amount': float(request_body['amount']),
+            'amountMinor': amount_minor,
+            'currencyExponent': exponent,
             'description': request_body['description'],
             'date': date_value,
             'type': request_body['type'],
             'category': request_body['category'],
+            'currency': currency,
             'createdAt': timestamp,
             'updatedAt': timestamp
         }
         
+        # Keep the request fingerprint with the transaction, so a retry can be checked
+        # against it even if the idempotency record was released
+        if claimed_key:
+            transaction_item[FINGERPRINT_ATTRIBUTE] = fingerprint
+        
         # Add optional fields if present
         if 'notes' in request_body:
             transaction_item['notes'] = request_body['notes']
@@ -99,29 +253,76 @@ def lambda_handler(event, context):
             if key not in transaction_item and isinstance(value, (dict, list)):
                 transaction_item[key] = value
         
-        # Serialize the item for DynamoDB
-        serialized_item = serialize_to_dynamodb(transaction_item)
+        # An earlier attempt with this key may have saved the transaction before it
+        # could store its response; answer from the stored item instead of a new one
+        stored_transaction = None
+        if claimed_key:
+            stored_transaction = get_stored_transaction(dynamodb, table_name, user_id, transaction_id)
         
-        # Save to DynamoDB
-        dynamodb.put_item(
-            TableName=table_name,
-            Item=serialized_item
-        )
+        if stored_transaction:
+            # Items without a fingerprint were created before it was stored and cannot be checked
+            if stored_transaction.pop(FINGERPRINT_ATTRIBUTE, fingerprint) != fingerprint:
+                release_idempotency_key(dynamodb, idempotency_table, claimed_key)
+                return key_reused_response()
+            logger.info(f"Transaction {transaction_id} already exists, returning the stored item")
+            status_code = 201
+            message = 'Transaction created successfully'
+        elif os.environ.get('TRANSACTION_WRITE_MODE', 'sync') == 'async':
+            # Enqueue the transaction and let the ingest consumer write it; a message
+            # enqueued again by a retry is skipped there because its ID already exists
+            get_transaction_queue().send(transaction_item)
+            logger.info(f"Transaction {transaction_id} queued for ingestion")
+            status_code = 202
+            message = 'Transaction accepted for processing'
+        else:
+            # Write the transaction and its balance checkpoint delta atomically;
+            # a transaction whose ID already exists is neither written nor counted again
+            existing = write_transactions_with_balance(
+                dynamodb,
+                table_name,
+                os.environ.get('BALANCE_CHECKPOINTS_TABLE', 'BalanceCheckpoints'),
+                [transaction_item]
+            )
+            if existing:
+                logger.info(f"Transaction {transaction_id} was written by an earlier attempt")
+                stored_transaction = get_stored_transaction(dynamodb, table_name, user_id, transaction_id)
+                if stored_transaction.pop(FINGERPRINT_ATTRIBUTE, fingerprint) != fingerprint:
+                    release_idempotency_key(dynamodb, idempotency_table, claimed_key)
+                    return key_reused_response()
+            
+            status_code = 201
+            message = 'Transaction created successfully'
         
-        return {
-            'statusCode': 201,
+        response = {
+            'statusCode': status_code,
             'headers': {
                 'Content-Type': 'application/json',
                 'Access-Control-Allow-Origin': '*',
                 'Access-Control-Allow-Credentials': True
             },
             'body': json.dumps({
-                'message': 'Transaction created successfully',
-                'transaction': transaction_item
+                'message': message,
+                'transaction': stored_transaction or {
+                    **{k: v for k, v in transaction_item.items() if k != FINGERPRINT_ATTRIBUTE},
+                    'amount': from_minor_units(amount_minor, exponent)
+                }
             })
         }
+        
+        # Store the response so retries with the same key are answered from it
+        if claimed_key:
+            try:
+                complete_idempotency_key(dynamodb, idempotency_table, claimed_key, response)
+            except ClientError as e:
+                # The transaction is saved; a retry re-claims the key and returns the stored item
+                logger.error(f"Failed to store response for idempotency key {claimed_key}: {str(e)}")
+                release_idempotency_key(dynamodb, idempotency_table, claimed_key)
+        
+        return response
     except ClientError as e:
         logger.error(f"DynamoDB error: {str(e)}")
+        if claimed_key:
+            release_idempotency_key(dynamodb, idempotency_table, claimed_key)
         return {
             'statusCode': 500,
             'headers': {
@@ -135,6 +336,8 @@ def lambda_handler(event, context):
         }
     except Exception as e:
         logger.error(f"Error creating transaction: {str(e)}")
+        if claimed_key:
+            release_idempotency_key(dynamodb, idempotency_table, claimed_key)
         return {
             'statusCode': 500,
             'headers': {
@@ -0,0 +1,178 @@
+import json
+import os
+import boto3
+import logging
+from datetime import datetime, timedelta, timezone
+from botocore.exceptions import ClientError
+from utils.dynamodb_utils import is_valid_currency, currency_exponent, from_minor_units
+from utils.balance_checkpoints import get_balance_on, get_balance_series
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+def parse_day(value):
+    """
+    Validate a YYYY-MM-DD query parameter
+
+    Args:
+        value (str): Date string to validate
+
+    Returns:
+        str: The validated date string
+    """
+    return datetime.strptime(value, '%Y-%m-%d').strftime('%Y-%m-%d')
+
+def lambda_handler(event, context):
+    """
+    Lambda function to retrieve a user's running balance.
+    `?date=YYYY-MM-DD` returns the balance on one day;
+    `?from=YYYY-MM-DD&to=YYYY-MM-DD` returns the balance series for a range.
+    Balances are kept per currency; `?currency=XXX` restricts the result to one.
+
+    Args:
+        event (dict): API Gateway Lambda Proxy Input Format
+        context (object): Lambda Context runtime methods and attributes
+
+    Returns:
+        dict: API Gateway Lambda Proxy Output Format
+    """
+    logger.info(f"Get balance request received: {json.dumps(event)}")
+
+    try:
+        # Extract user ID from the Cognito authorizer
+        # The authorizer adds the claims to the requestContext
+        user_id = None
+
+        # Check if we have Cognito claims
+        if 'requestContext' in event and 'authorizer' in event['requestContext']:
+            authorizer = event['requestContext']['authorizer']
+
+            # JWT authorizer puts claims directly in the authorizer object
+            if 'claims' in authorizer and 'sub' in authorizer['claims']:
+                user_id = authorizer['claims']['sub']
+            # Lambda authorizer might put claims in a JWT object
+            elif 'jwt' in authorizer and 'claims' in authorizer['jwt'] and 'sub' in authorizer['jwt']['claims']:
+                user_id = authorizer['jwt']['claims']['sub']
+
+        # Fallback for testing only - remove in production
+        if not user_id:
+            logger.warning("No user ID found in authorizer, using test user ID")
+            user_id = 'test-user-id'
+
+        logger.info(f"Using user ID: {user_id}")
+
+        # Parse and validate the requested day or range
+        query_params = event.get('queryStringParameters', {}) or {}
+        today = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+        try:
+            if 'from' in query_params or 'to' in query_params:
+                end_day = parse_day(query_params.get('to', today))
+                start_day = parse_day(query_params.get(
+                    'from',
+                    (datetime.strptime(end_day, '%Y-%m-%d') - timedelta(days=30)).strftime('%Y-%m-%d')
+                ))
+                if start_day > end_day:
+                    raise ValueError('from must not be after to')
+            else:
+                start_day = None
+                end_day = parse_day(query_params.get('date', today))
+        except ValueError as e:
+            return {
+                'statusCode': 400,
+                'headers': {
+                    'Content-Type': 'application/json',
+                    'Access-Control-Allow-Origin': '*',
+                    'Access-Control-Allow-Credentials': True
+                },
+                'body': json.dumps({
+                    'message': f'Invalid date: {str(e)}'
+                })
+            }
+
+        currency = query_params.get('currency')
+        if currency:
+            if not is_valid_currency(currency):
+                return {
+                    'statusCode': 400,
+                    'headers': {
+                        'Content-Type': 'application/json',
+                        'Access-Control-Allow-Origin': '*',
+                        'Access-Control-Allow-Credentials': True
+                    },
+                    'body': json.dumps({
+                        'message': f'Unsupported currency: {currency}'
+                    })
+                }
+            currency = currency.upper()
+
+        # Initialize DynamoDB client
+        dynamodb = boto3.client('dynamodb')
+        checkpoints_table = os.environ.get('BALANCE_CHECKPOINTS_TABLE', 'BalanceCheckpoints')
+        transactions_table = os.environ.get('TRANSACTIONS_TABLE', 'Transactions')
+
+        # Each currency's balance is reported in that currency; currencies are never mixed
+        if start_day is None:
+            balances = get_balance_on(
+                dynamodb, checkpoints_table, transactions_table, user_id, end_day, currency
+            )
+            result = {
+                'date': end_day,
+                'balances': {
+                    c: from_minor_units(balance_minor, currency_exponent(c))
+                    for c, balance_minor in sorted(balances.items())
+                }
+            }
+        else:
+            series = get_balance_series(
+                dynamodb, checkpoints_table, transactions_table, user_id, start_day, end_day, currency
+            )
+            result = {
+                'from': start_day,
+                'to': end_day,
+                'balances': {
+                    c: {
+                        'openingBalance': from_minor_units(opening_minor, currency_exponent(c)),
+                        'series': [
+                            {'date': day, 'balance': from_minor_units(closing_minor, currency_exponent(c))}
+                            for day, closing_minor in points
+                        ]
+                    }
+                    for c, (opening_minor, points) in sorted(series.items())
+                }
+            }
+
+        return {
+            'statusCode': 200,
+            'headers': {
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': '*',
+                'Access-Control-Allow-Credentials': True
+            },
+            'body': json.dumps(result)
+        }
+    except ClientError as e:
+        logger.error(f"DynamoDB error: {str(e)}")
+        return {
+            'statusCode': 500,
+            'headers': {
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': '*',
+                'Access-Control-Allow-Credentials': True
+            },
+            'body': json.dumps({
+                'message': f'Database error: {str(e)}'
+            })
+        }
+    except Exception as e:
+        logger.error(f"Error getting balance: {str(e)}")
+        return {
+            'statusCode': 500,
+            'headers': {
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': '*',
+                'Access-Control-Allow-Credentials': True
+            },
+            'body': json.dumps({
+                'message': f'Error retrieving balance: {str(e)}'
+            })
+        }
@@ -4,7 +4,15 @@ import boto3
 import logging
 from datetime import datetime
 from botocore.exceptions import ClientError
-from utils.dynamodb_utils import deserialize_from_dynamodb
+from utils.dynamodb_utils import (
+    deserialize_transaction,
+    deserialize_from_dynamodb,
+    is_valid_currency,
+    currency_exponent,
+    from_minor_units
+)
+from utils.idempotency import FINGERPRINT_ATTRIBUTE
+from utils.fx_rates import convert_transactions, FxRatesUnavailableError, DEFAULT_CURRENCY
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -36,6 +44,67 @@ def format_date(date_str):
         # Return today's date as fallback
         return datetime.utcnow().strftime('%Y-%m-%d')
 
+def get_preferred_currency(dynamodb, user_id):
+    """
+    Read the user's preferred currency from their profile
+    
+    Args:
+        dynamodb (object): DynamoDB client
+        user_id (str): User ID
+        
+    Returns:
+        str: Currency code from `preferences.currency`, or the default currency
+    """
+    response = dynamodb.get_item(
+        TableName=os.environ.get('USER_SETTINGS_TABLE', 'UserSettings'),
+        Key={'userId': {'S': user_id}},
+        ProjectionExpression='preferences'
+    )
+    profile = deserialize_from_dynamodb(response.get('Item', {}))
+    currency = (profile.get('preferences') or {}).get('currency')
+    return currency.upper() if is_valid_currency(currency) else DEFAULT_CURRENCY
+
+def summarize_transactions(transactions, currency):
+    """
+    Aggregate transaction amounts into credit, debit and per-category totals
+
+    Args:
+        transactions (list): Deserialized transactions, all in the same currency
+        currency (str): Currency the amounts are expressed in
+
+    Returns:
+        dict: Transaction totals
+    """
+    # Sum integer minor units so totals are exact
+    credit = sum(t['amountMinor'] for t in transactions if t.get('type') == 'credit')
+    debit = sum(t['amountMinor'] for t in transactions if t.get('type') == 'debit')
+
+    # Split each category like the totals, so credits and debits never add up unsigned
+    by_category = {}
+    for transaction in transactions:
+        totals = by_category.setdefault(transaction.get('category', 'Other'), {'credit': 0, 'debit': 0})
+        if transaction.get('type') in totals:
+            totals[transaction['type']] += transaction['amountMinor']
+
+    exponent = currency_exponent(currency)
+    return {
+        'currency': currency,
+        'count': len(transactions),
+        'totals': {
+            'credit': from_minor_units(credit, exponent),
+            'debit': from_minor_units(debit, exponent),
+            'net': from_minor_units(credit - debit, exponent)
+        },
+        'byCategory': {
+            category: {
+                'credit': from_minor_units(totals['credit'], exponent),
+                'debit': from_minor_units(totals['debit'], exponent),
+                'net': from_minor_units(totals['credit'] - totals['debit'], exponent)
+            }
+            for category, totals in by_category.items()
+        }
+    }
+
 def lambda_handler(event, context):
     """
     Lambda function to retrieve transactions for a user.
@@ -87,19 +156,59 @@ def lambda_handler(event, context):
         
         # Deserialize the items from DynamoDB format
         raw_items = response.get('Items', [])
-        transactions = [deserialize_from_dynamodb(item) for item in raw_items]
+        # Amounts are decoded from integer minor units (legacy items are converted)
+        transactions = [deserialize_transaction(item) for item in raw_items]
         
-        # Format dates consistently
+        # Format dates consistently and drop internal attributes
         for transaction in transactions:
+            transaction.pop(FINGERPRINT_ATTRIBUTE, None)
             if 'date' in transaction and transaction['date']:
                 transaction['date'] = format_date(transaction['date'])
-            
-            # Ensure amount is a number
-            if 'amount' in transaction:
-                try:
-                    transaction['amount'] = float(transaction['amount'])
-                except (ValueError, TypeError):
-                    transaction['amount'] = 0
+        
+        query_params = event.get('queryStringParameters', {}) or {}
+        summary = query_params.get('summary') == 'true'
+        target_currency = query_params.get('currency')
+        if target_currency and not is_valid_currency(target_currency):
+            return {
+                'statusCode': 400,
+                'headers': {
+                    'Content-Type': 'application/json',
+                    'Access-Control-Allow-Origin': '*',
+                    'Access-Control-Allow-Credentials': True
+                },
+                'body': json.dumps({
+                    'message': f'Unsupported currency: {target_currency}'
+                })
+            }
+        
+        # Totals are only meaningful in one currency, so summaries always convert,
+        # defaulting to the currency in the user's profile preferences
+        if summary and not target_currency:
+            target_currency = get_preferred_currency(dynamodb, user_id)
+        
+        # Convert amounts to the target currency
+        if target_currency:
+            try:
+                convert_transactions(transactions, target_currency)
+            except FxRatesUnavailableError as e:
+                logger.error(f"FX rates unavailable: {str(e)}")
+                return {
+                    'statusCode': 503,
+                    'headers': {
+                        'Content-Type': 'application/json',
+                        'Access-Control-Allow-Origin': '*',
+                        'Access-Control-Allow-Credentials': True
+                    },
+                    'body': json.dumps({
+                        'message': f'Currency conversion is unavailable: {str(e)}'
+                    })
+                }
+        
+        # Return totals instead of the raw list when a summary is requested
+        if summary:
+            result = summarize_transactions(transactions, target_currency.upper())
+        else:
+            result = transactions
         
         return {
             'statusCode': 200,
@@ -108,7 +217,7 @@ def lambda_handler(event, context):
                 'Access-Control-Allow-Origin': '*',
                 'Access-Control-Allow-Credentials': True
             },
-            'body': json.dumps(transactions)
+            'body': json.dumps(result)
         }
     except ClientError as e:
         logger.error(f"DynamoDB error: {str(e)}")
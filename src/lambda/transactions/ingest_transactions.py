@@ -0,0 +1,128 @@
+import json
+import os
+import boto3
+import logging
+from botocore.exceptions import ClientError
+from utils.transaction_queue import get_local_transaction_queue
+from utils.balance_checkpoints import write_transactions_with_balance, TRANSACT_CHUNK_SIZE
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+def write_transactions(dynamodb, table_name, messages):
+    """
+    Write queued transactions to DynamoDB together with their balance checkpoint deltas
+
+    Args:
+        dynamodb (object): DynamoDB client
+        table_name (str): Transactions table name
+        messages (list): (message_id, transaction) tuples
+
+    Returns:
+        list: Message IDs whose transactions could not be written
+    """
+    checkpoints_table = os.environ.get('BALANCE_CHECKPOINTS_TABLE', 'BalanceCheckpoints')
+
+    # A message can be delivered more than once; a transaction may appear only once per write
+    message_ids_by_key = {}
+    items_by_key = {}
+    failed_ids = []
+    for message_id, transaction in messages:
+        try:
+            key = (transaction['userId'], transaction['id'])
+        except (KeyError, TypeError):
+            logger.error(f"Message {message_id} is not a valid transaction")
+            failed_ids.append(message_id)
+            continue
+        message_ids_by_key.setdefault(key, []).append(message_id)
+        items_by_key[key] = transaction
+
+    def write(keys):
+        # Redelivered transactions already exist and are skipped without re-applying their delta
+        existing = write_transactions_with_balance(
+            dynamodb, table_name, checkpoints_table, [items_by_key[key] for key in keys]
+        )
+        if existing:
+            logger.info(f"Skipped {len(existing)} transactions that were already written")
+
+    keys = list(items_by_key)
+    failed_keys = []
+
+    for start in range(0, len(keys), TRANSACT_CHUNK_SIZE):
+        chunk = keys[start:start + TRANSACT_CHUNK_SIZE]
+        try:
+            write(chunk)
+        except (ClientError, RuntimeError, KeyError, TypeError, ValueError) as e:
+            logger.error(f"Error writing {len(chunk)} transactions, retrying one at a time: {str(e)}")
+            # A chunk is written atomically, so one bad transaction fails all of them;
+            # write them one at a time so only the bad ones are reported
+            for key in chunk:
+                try:
+                    write([key])
+                except (ClientError, RuntimeError, KeyError, TypeError, ValueError) as e:
+                    logger.error(f"Error writing transaction {key[1]}: {str(e)}")
+                    failed_keys.append(key)
+
+    return failed_ids + [message_id for key in failed_keys for message_id in message_ids_by_key[key]]
+
+def lambda_handler(event, context):
+    """
+    Lambda function that drains queued transactions into DynamoDB.
+    Invoked by the SQS event source, or without records to drain the local queue.
+
+    Args:
+        event (dict): SQS event, or an empty event for the local queue
+        context (object): Lambda Context runtime methods and attributes
+
+    Returns:
+        dict: SQS partial batch response listing failed messages
+    """
+    records = event.get('Records')
+    logger.info(f"Ingest transactions request received with {len(records or [])} records")
+
+    dynamodb = boto3.client('dynamodb')
+    table_name = os.environ.get('TRANSACTIONS_TABLE', 'Transactions')
+
+    if records is not None:
+        # SQS: failed messages are retried and then redriven to the dead-letter queue
+        messages = []
+        failed_ids = []
+        for record in records:
+            try:
+                messages.append((record['messageId'], json.loads(record['body'])))
+            except ValueError:
+                # Only the malformed message is retried and eventually dead-lettered
+                logger.error(f"Message {record['messageId']} has a malformed body")
+                failed_ids.append(record['messageId'])
+        failed_ids += write_transactions(dynamodb, table_name, messages)
+
+        return {
+            'batchItemFailures': [{'itemIdentifier': message_id} for message_id in failed_ids]
+        }
+
+    # Local stand-in: drain the queue and dead-letter failures directly
+    queue = get_local_transaction_queue()
+    if queue is None:
+        raise RuntimeError('Invoked without SQS records but no local transaction queue is configured')
+    batch_size = int(event.get('batchSize', TRANSACT_CHUNK_SIZE))
+    written = 0
+    dead_lettered = 0
+
+    while True:
+        messages = queue.receive(batch_size)
+        if not messages:
+            break
+
+        failed_ids = set(write_transactions(dynamodb, table_name, messages))
+        failed = [message for message in messages if message[0] in failed_ids]
+        if failed:
+            queue.dead_letter(failed)
+
+        written += len(messages) - len(failed)
+        dead_lettered += len(failed)
+
+    logger.info(f"Drained local queue: {written} written, {dead_lettered} dead-lettered")
+    return {
+        'written': written,
+        'deadLettered': dead_lettered
+    }
@@ -0,0 +1,56 @@
+import os
+import boto3
+import logging
+from utils.balance_checkpoints import materialize_balances, STATE_KEY
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+def changed_checkpoints(records):
+    """
+    Find the earliest changed day per user and currency in a batch of stream records
+
+    Args:
+        records (list): DynamoDB Streams records from the balance checkpoints table
+
+    Returns:
+        dict: Earliest changed day keyed by (userId, currency)
+    """
+    earliest = {}
+    for record in records:
+        change = record['dynamodb']
+        key = change['Keys']['checkpointKey']['S']
+        if key == STATE_KEY:
+            continue
+
+        # Only net changes matter; closing balances written by this function are ignored
+        new_net = change.get('NewImage', {}).get('dayNetMinor', {}).get('N')
+        old_net = change.get('OldImage', {}).get('dayNetMinor', {}).get('N')
+        if new_net == old_net:
+            continue
+
+        currency, day = key.split('#', 1)
+        user_key = (change['Keys']['userId']['S'], currency)
+        if user_key not in earliest or day < earliest[user_key]:
+            earliest[user_key] = day
+    return earliest
+
+def lambda_handler(event, context):
+    """
+    Lambda function that materializes closing balances from the balance
+    checkpoints table stream, keeping the later-day shift off the request path.
+    Recomputation is idempotent, so failed batches are simply retried.
+
+    Args:
+        event (dict): DynamoDB Streams event
+        context (object): Lambda Context runtime methods and attributes
+    """
+    records = event.get('Records', [])
+    logger.info(f"Materialize balances request received with {len(records)} records")
+
+    dynamodb = boto3.client('dynamodb')
+    checkpoints_table = os.environ.get('BALANCE_CHECKPOINTS_TABLE', 'BalanceCheckpoints')
+    transactions_table = os.environ.get('TRANSACTIONS_TABLE', 'Transactions')
+
+    for (user_id, currency), day in changed_checkpoints(records).items():
+        materialize_balances(dynamodb, checkpoints_table, transactions_table, user_id, currency, day)
@@ -5,6 +5,8 @@ locals {
   # DynamoDB table names
   transactions_table_name = "Transactions-${local.environment}"
   user_settings_table_name = "UserSettings-${local.environment}"
+  balance_checkpoints_table_name = "BalanceCheckpoints-${local.environment}"
+  idempotency_table_name = "IdempotencyKeys-${local.environment}"
   
   # S3 bucket names
   frontend_bucket_name = "${local.project}-frontend-${local.environment}"
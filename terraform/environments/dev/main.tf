@@ -14,6 +14,7 @@ module "api_gateway" {
   # Lambda function ARNs
   get_transactions_lambda_invoke_arn    = module.lambda.get_transactions_lambda_invoke_arn
   create_transaction_lambda_invoke_arn  = module.lambda.create_transaction_lambda_invoke_arn
+  get_balance_lambda_invoke_arn         = module.lambda.get_balance_lambda_invoke_arn
   get_profile_lambda_invoke_arn         = module.lambda.get_profile_lambda_invoke_arn
   get_market_data_lambda_invoke_arn     = module.lambda.get_market_data_lambda_invoke_arn
 }
@@ -34,6 +35,8 @@ module "dynamodb" {
   
   transactions_table_name = local.transactions_table_name
   user_settings_table_name = local.user_settings_table_name
+  balance_checkpoints_table_name = local.balance_checkpoints_table_name
+  idempotency_table_name = local.idempotency_table_name
 }
 
 # Lambda Functions
@@ -45,6 +48,9 @@ module "lambda" {
   
   transactions_table_name = module.dynamodb.transactions_table_name
   user_settings_table_name = module.dynamodb.user_settings_table_name
+  balance_checkpoints_table_name = module.dynamodb.balance_checkpoints_table_name
+  balance_checkpoints_stream_arn = module.dynamodb.balance_checkpoints_stream_arn
+  idempotency_table_name = module.dynamodb.idempotency_table_name
   
   cognito_user_pool_id = module.cognito.user_pool_id
   cognito_client_id = module.cognito.client_id
@@ -21,4 +21,9 @@ output "cloudfront_distribution_domain" {
 output "frontend_bucket_name" {
   description = "The name of the S3 bucket for the frontend"
   value       = module.frontend.bucket_name
-} 
\ No newline at end of file
+}
+
+output "backfill_balances_lambda_name" {
+  description = "The name of the Lambda function that backfills balance checkpoints"
+  value       = module.lambda.backfill_balances_lambda_name
+}
@@ -7,9 +7,10 @@ module "api_gateway" {
   protocol_type = "HTTP"
 
   cors_configuration = {
-    allow_headers = ["content-type", "x-amz-date", "authorization", "x-api-key", "x-amz-security-token", "x-amz-user-agent"]
-    allow_methods = ["*"]
-    allow_origins = ["*"]
+    allow_headers  = ["content-type", "x-amz-date", "authorization", "x-api-key", "x-amz-security-token", "x-amz-user-agent", "idempotency-key"]
+    expose_headers = ["idempotent-replayed"]
+    allow_methods  = ["*"]
+    allow_origins  = ["*"]
   }
 
   # Domain
@@ -41,6 +42,16 @@ module "api_gateway" {
       authorizer_id      = aws_apigatewayv2_authorizer.cognito.id
     }
 
+    "GET /transactions/balance" = {
+      integration = {
+        uri                    = var.get_balance_lambda_invoke_arn
+        payload_format_version = "2.0"
+        timeout_milliseconds   = 12000
+      }
+      authorization_type = "JWT"
+      authorizer_id      = aws_apigatewayv2_authorizer.cognito.id
+    }
+
     # User profile routes
     "GET /user/profile" = {
       integration = {
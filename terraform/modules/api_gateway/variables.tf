@@ -38,6 +38,11 @@ variable "create_transaction_lambda_invoke_arn" {
   type        = string
 }
 
+variable "get_balance_lambda_invoke_arn" {
+  description = "The invoke ARN of the get balance Lambda function"
+  type        = string
+}
+
 variable "get_profile_lambda_invoke_arn" {
   description = "The invoke ARN of the get profile Lambda function"
   type        = string
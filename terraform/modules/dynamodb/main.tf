@@ -62,4 +62,64 @@ module "dynamodb_user_settings_table" {
     Name        = var.user_settings_table_name
     Environment = var.environment
   }
-} 
\ No newline at end of file
+} 
+
+module "dynamodb_balance_checkpoints_table" {
+  source  = "terraform-aws-modules/dynamodb-table/aws"
+  version = "~> 4.0"
+
+  name      = var.balance_checkpoints_table_name
+  hash_key  = "userId"
+  range_key = "checkpointKey"
+  
+  billing_mode = "PAY_PER_REQUEST"
+  
+  # checkpointKey is "<currency>#<YYYY-MM-DD>", plus one "STATE" item per user
+  attributes = [
+    {
+      name = "userId"
+      type = "S"
+    },
+    {
+      name = "checkpointKey"
+      type = "S"
+    }
+  ]
+  
+  # Daily net changes are streamed to the Lambda that materializes closing balances
+  stream_enabled   = true
+  stream_view_type = "NEW_AND_OLD_IMAGES"
+  
+  point_in_time_recovery_enabled = true
+  
+  tags = {
+    Name        = var.balance_checkpoints_table_name
+    Environment = var.environment
+  }
+}
+
+module "dynamodb_idempotency_table" {
+  source  = "terraform-aws-modules/dynamodb-table/aws"
+  version = "~> 4.0"
+
+  name     = var.idempotency_table_name
+  hash_key = "idempotencyKey"
+  
+  billing_mode = "PAY_PER_REQUEST"
+  
+  attributes = [
+    {
+      name = "idempotencyKey"
+      type = "S"
+    }
+  ]
+  
+  # Stored responses expire automatically
+  ttl_enabled        = true
+  ttl_attribute_name = "expiresAt"
+  
+  tags = {
+    Name        = var.idempotency_table_name
+    Environment = var.environment
+  }
+}
\ No newline at end of file
@@ -16,4 +16,29 @@ output "user_settings_table_name" {
 output "user_settings_table_arn" {
   description = "The ARN of the DynamoDB table for user settings"
   value       = module.dynamodb_user_settings_table.dynamodb_table_arn
-} 
\ No newline at end of file
+} 
+
+output "balance_checkpoints_table_name" {
+  description = "The name of the DynamoDB table for daily running-balance checkpoints"
+  value       = module.dynamodb_balance_checkpoints_table.dynamodb_table_id
+}
+
+output "balance_checkpoints_table_arn" {
+  description = "The ARN of the DynamoDB table for daily running-balance checkpoints"
+  value       = module.dynamodb_balance_checkpoints_table.dynamodb_table_arn
+}
+
+output "balance_checkpoints_stream_arn" {
+  description = "The stream ARN of the DynamoDB table for daily running-balance checkpoints"
+  value       = module.dynamodb_balance_checkpoints_table.dynamodb_table_stream_arn
+}
+
+output "idempotency_table_name" {
+  description = "The name of the DynamoDB table for idempotency keys"
+  value       = module.dynamodb_idempotency_table.dynamodb_table_id
+}
+
+output "idempotency_table_arn" {
+  description = "The ARN of the DynamoDB table for idempotency keys"
+  value       = module.dynamodb_idempotency_table.dynamodb_table_arn
+}
\ No newline at end of file
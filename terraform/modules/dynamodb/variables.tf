@@ -8,6 +8,16 @@ variable "user_settings_table_name" {
   type        = string
 }
 
+variable "balance_checkpoints_table_name" {
+  description = "The name of the DynamoDB table for daily running-balance checkpoints"
+  type        = string
+}
+
+variable "idempotency_table_name" {
+  description = "The name of the DynamoDB table for idempotency keys"
+  type        = string
+}
+
 variable "environment" {
   description = "The environment (dev, staging, prod)"
   type        = string
@@ -0,0 +1,112 @@
+# Materializes closing balances from the balance checkpoints table stream,
+# so the later-day shift never runs on the request path
+module "materialize_balances_lambda" {
+  source  = "terraform-aws-modules/lambda/aws"
+  version = "~> 6.0"
+
+  function_name = "financial-dashboard-materialize-balances-${var.environment}"
+  description   = "Materializes running-balance checkpoints for the Financial Dashboard"
+  handler       = "materialize_balances.lambda_handler"
+  runtime       = "python3.9"
+  timeout       = 300
+  
+  source_path = "${local.lambda_src_path}/transactions"
+  
+  create_role = false
+  lambda_role = module.lambda_role.iam_role_arn
+  
+  layers = [
+    module.lambda_layer_utils.lambda_layer_arn
+  ]
+  
+  environment_variables = {
+    TRANSACTIONS_TABLE        = var.transactions_table_name
+    BALANCE_CHECKPOINTS_TABLE = var.balance_checkpoints_table_name
+  }
+  
+  event_source_mapping = {
+    dynamodb = {
+      event_source_arn               = var.balance_checkpoints_stream_arn
+      starting_position              = "LATEST"
+      batch_size                     = 100
+      parallelization_factor         = 1
+      bisect_batch_on_function_error = true
+      maximum_retry_attempts         = 10
+    }
+  }
+  
+  # CloudWatch Logs configuration
+  cloudwatch_logs_retention_in_days = 30
+  cloudwatch_logs_tags = {
+    Environment = var.environment
+    Function    = "materialize-balances"
+  }
+  
+  tags = {
+    Environment = var.environment
+    Function    = "materialize-balances"
+  }
+}
+
+# Rebuilds checkpoints for users whose transactions predate them; invoked by deploy.sh
+module "backfill_balances_lambda" {
+  source  = "terraform-aws-modules/lambda/aws"
+  version = "~> 6.0"
+
+  function_name = "financial-dashboard-backfill-balances-${var.environment}"
+  description   = "Backfills running-balance checkpoints for the Financial Dashboard"
+  handler       = "backfill_balances.lambda_handler"
+  runtime       = "python3.9"
+  timeout       = 900
+  
+  source_path = "${local.lambda_src_path}/transactions"
+  
+  create_role = false
+  lambda_role = module.lambda_role.iam_role_arn
+  
+  layers = [
+    module.lambda_layer_utils.lambda_layer_arn
+  ]
+  
+  environment_variables = {
+    TRANSACTIONS_TABLE        = var.transactions_table_name
+    BALANCE_CHECKPOINTS_TABLE = var.balance_checkpoints_table_name
+  }
+  
+  # CloudWatch Logs configuration
+  cloudwatch_logs_retention_in_days = 30
+  cloudwatch_logs_tags = {
+    Environment = var.environment
+    Function    = "backfill-balances"
+  }
+  
+  tags = {
+    Environment = var.environment
+    Function    = "backfill-balances"
+  }
+}
+
+# IAM policy for Lambda to read the balance checkpoints stream
+module "lambda_policy_balance_stream" {
+  source  = "terraform-aws-modules/iam/aws//modules/iam-policy"
+  version = "~> 5.52"
+
+  name        = "financial-dashboard-lambda-balance-stream-policy-${var.environment}"
+  description = "IAM policy for Lambda to read the balance checkpoints stream"
+  
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Action = [
+          "dynamodb:GetRecords",
+          "dynamodb:GetShardIterator",
+          "dynamodb:DescribeStream",
+          "dynamodb:ListStreams"
+        ]
+        Effect   = "Allow"
+        Resource = var.balance_checkpoints_stream_arn
+      }
+    ]
+  })
+}
@@ -0,0 +1,93 @@
+# Queue for asynchronous (write-behind) transaction ingestion
+module "transactions_queue" {
+  source  = "terraform-aws-modules/sqs/aws"
+  version = "~> 4.0"
+
+  name = "financial-dashboard-transactions-${var.environment}"
+  
+  # Must exceed the ingest Lambda timeout so in-flight batches are not redelivered
+  visibility_timeout_seconds = 180
+  
+  # Messages that keep failing are moved to the dead-letter queue
+  create_dlq = true
+  dlq_name   = "financial-dashboard-transactions-dlq-${var.environment}"
+  redrive_policy = {
+    maxReceiveCount = 5
+  }
+  
+  tags = {
+    Environment = var.environment
+    Function    = "ingest-transactions"
+  }
+}
+
+module "ingest_transactions_lambda" {
+  source  = "terraform-aws-modules/lambda/aws"
+  version = "~> 6.0"
+
+  function_name = "financial-dashboard-ingest-transactions-${var.environment}"
+  description   = "Drains queued transactions into DynamoDB for the Financial Dashboard"
+  handler       = "ingest_transactions.lambda_handler"
+  runtime       = "python3.9"
+  timeout       = 60
+  
+  source_path = "${local.lambda_src_path}/transactions"
+  
+  create_role = false
+  lambda_role = module.lambda_role.iam_role_arn
+  
+  layers = [
+    module.lambda_layer_utils.lambda_layer_arn
+  ]
+  
+  environment_variables = {
+    TRANSACTIONS_TABLE        = var.transactions_table_name
+    BALANCE_CHECKPOINTS_TABLE = var.balance_checkpoints_table_name
+  }
+  
+  event_source_mapping = {
+    sqs = {
+      event_source_arn                   = module.transactions_queue.queue_arn
+      batch_size                         = 100
+      maximum_batching_window_in_seconds = 5
+      function_response_types            = ["ReportBatchItemFailures"]
+    }
+  }
+  
+  # CloudWatch Logs configuration
+  cloudwatch_logs_retention_in_days = 30
+  cloudwatch_logs_tags = {
+    Environment = var.environment
+    Function    = "ingest-transactions"
+  }
+  
+  tags = {
+    Environment = var.environment
+    Function    = "ingest-transactions"
+  }
+}
+
+# IAM policy for Lambda to produce to and consume from the transactions queue
+module "lambda_policy_sqs" {
+  source  = "terraform-aws-modules/iam/aws//modules/iam-policy"
+  version = "~> 5.52"
+
+  name        = "financial-dashboard-lambda-sqs-policy-${var.environment}"
+  description = "IAM policy for Lambda to use the transactions ingestion queue"
+  
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Action = [
+          "sqs:SendMessage",
+          "sqs:ReceiveMessage",
+          "sqs:DeleteMessage",
+          "sqs:GetQueueAttributes"
+        ]
+        Effect   = "Allow"
+        Resource = module.transactions_queue.queue_arn
+      }
+    ]
+  })
+}
\ No newline at end of file
@@ -27,7 +27,9 @@ module "lambda_role" {
   
   custom_role_policy_arns = [
     module.lambda_policy_dynamodb.arn,
-    module.lambda_policy_logs.arn
+    module.lambda_policy_logs.arn,
+    module.lambda_policy_sqs.arn,
+    module.lambda_policy_balance_stream.arn
   ]
   
   trusted_role_services = ["lambda.amazonaws.com"]
@@ -57,7 +59,9 @@ module "lambda_policy_dynamodb" {
         Resource = [
           "arn:aws:dynamodb:*:*:table/${var.transactions_table_name}",
           "arn:aws:dynamodb:*:*:table/${var.transactions_table_name}/index/*",
-          "arn:aws:dynamodb:*:*:table/${var.user_settings_table_name}"
+          "arn:aws:dynamodb:*:*:table/${var.user_settings_table_name}",
+          "arn:aws:dynamodb:*:*:table/${var.balance_checkpoints_table_name}",
+          "arn:aws:dynamodb:*:*:table/${var.idempotency_table_name}"
         ]
       }
     ]
@@ -86,4 +90,35 @@ module "lambda_policy_logs" {
       }
     ]
   })
-} 
\ No newline at end of file
+} 
+
+# IAM policy for Lambda to read the FX rate table
+module "lambda_policy_fx_rates" {
+  source  = "terraform-aws-modules/iam/aws//modules/iam-policy"
+  version = "~> 5.52"
+
+  create_policy = var.fx_rates_bucket != ""
+
+  name        = "financial-dashboard-lambda-fx-rates-policy-${var.environment}"
+  description = "IAM policy for Lambda to read the FX rate table from S3"
+  
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Action = [
+          "s3:GetObject"
+        ]
+        Effect   = "Allow"
+        Resource = "arn:aws:s3:::${var.fx_rates_bucket}/${var.fx_rates_key}"
+      }
+    ]
+  })
+}
+
+resource "aws_iam_role_policy_attachment" "lambda_fx_rates" {
+  count = var.fx_rates_bucket != "" ? 1 : 0
+
+  role       = module.lambda_role.iam_role_name
+  policy_arn = module.lambda_policy_fx_rates.arn
+}
\ No newline at end of file
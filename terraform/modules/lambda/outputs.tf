@@ -8,6 +8,26 @@ output "create_transaction_lambda_invoke_arn" {
   value       = module.create_transaction_lambda.lambda_function_invoke_arn
 }
 
+output "get_balance_lambda_invoke_arn" {
+  description = "The invoke ARN of the get balance Lambda function"
+  value       = module.get_balance_lambda.lambda_function_invoke_arn
+}
+
+output "backfill_balances_lambda_name" {
+  description = "The name of the Lambda function that backfills balance checkpoints"
+  value       = module.backfill_balances_lambda.lambda_function_name
+}
+
+output "transactions_queue_url" {
+  description = "The URL of the transactions ingestion queue"
+  value       = module.transactions_queue.queue_url
+}
+
+output "transactions_dlq_url" {
+  description = "The URL of the transactions ingestion dead-letter queue"
+  value       = module.transactions_queue.dead_letter_queue_url
+}
+
 output "get_profile_lambda_invoke_arn" {
   description = "The invoke ARN of the get profile Lambda function"
   value       = module.get_profile_lambda.lambda_function_invoke_arn
@@ -6,6 +6,10 @@ module "lambda_error_alarm" {
   for_each = {
     get_transactions = module.get_transactions_lambda.lambda_function_name
     create_transaction = module.create_transaction_lambda.lambda_function_name
+    ingest_transactions = module.ingest_transactions_lambda.lambda_function_name
+    get_balance      = module.get_balance_lambda.lambda_function_name
+    materialize_balances = module.materialize_balances_lambda.lambda_function_name
+    backfill_balances = module.backfill_balances_lambda.lambda_function_name
     get_profile      = module.get_profile_lambda.lambda_function_name
     get_market_data  = module.get_market_data_lambda.lambda_function_name
   }
@@ -17,7 +17,11 @@ module "get_transactions_lambda" {
   ]
   
   environment_variables = {
-    TRANSACTIONS_TABLE = var.transactions_table_name
+    TRANSACTIONS_TABLE   = var.transactions_table_name
+    USER_SETTINGS_TABLE  = var.user_settings_table_name
+    FX_RATES_BUCKET      = var.fx_rates_bucket
+    FX_RATES_KEY         = var.fx_rates_key
+    FX_RATES_TTL_SECONDS = var.fx_rates_ttl_seconds
   }
   
   # CloudWatch Logs configuration
@@ -52,7 +56,12 @@ module "create_transaction_lambda" {
   ]
   
   environment_variables = {
-    TRANSACTIONS_TABLE = var.transactions_table_name
+    TRANSACTIONS_TABLE        = var.transactions_table_name
+    BALANCE_CHECKPOINTS_TABLE = var.balance_checkpoints_table_name
+    TRANSACTION_WRITE_MODE    = var.transaction_write_mode
+    TRANSACTIONS_QUEUE_URL    = module.transactions_queue.queue_url
+    IDEMPOTENCY_TABLE         = var.idempotency_table_name
+    IDEMPOTENCY_TTL_SECONDS   = var.idempotency_ttl_seconds
   }
   
   # CloudWatch Logs configuration
@@ -68,6 +77,42 @@ module "create_transaction_lambda" {
   }
 }
 
+module "get_balance_lambda" {
+  source  = "terraform-aws-modules/lambda/aws"
+  version = "~> 6.0"
+
+  function_name = "financial-dashboard-get-balance-${var.environment}"
+  description   = "Get running balance Lambda function for the Financial Dashboard"
+  handler       = "get_balance.lambda_handler"
+  runtime       = "python3.9"
+  
+  source_path = "${local.lambda_src_path}/transactions"
+  
+  create_role = false
+  lambda_role = module.lambda_role.iam_role_arn
+  
+  layers = [
+    module.lambda_layer_utils.lambda_layer_arn
+  ]
+  
+  environment_variables = {
+    TRANSACTIONS_TABLE        = var.transactions_table_name
+    BALANCE_CHECKPOINTS_TABLE = var.balance_checkpoints_table_name
+  }
+  
+  # CloudWatch Logs configuration
+  cloudwatch_logs_retention_in_days = 30
+  cloudwatch_logs_tags = {
+    Environment = var.environment
+    Function    = "get-balance"
+  }
+  
+  tags = {
+    Environment = var.environment
+    Function    = "get-balance"
+  }
+}
+
 # Lambda permissions for API Gateway
 resource "aws_lambda_permission" "get_transactions" {
   statement_id  = "AllowAPIGatewayInvoke"
@@ -83,4 +128,12 @@ resource "aws_lambda_permission" "create_transaction" {
   function_name = module.create_transaction_lambda.lambda_function_name
   principal     = "apigateway.amazonaws.com"
   source_arn    = "${var.api_gateway_execution_arn}/*/*"
-} 
\ No newline at end of file
+} 
+
+resource "aws_lambda_permission" "get_balance" {
+  statement_id  = "AllowAPIGatewayInvoke"
+  action        = "lambda:InvokeFunction"
+  function_name = module.get_balance_lambda.lambda_function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${var.api_gateway_execution_arn}/*/*"
+}
\ No newline at end of file
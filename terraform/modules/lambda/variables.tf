@@ -13,6 +13,27 @@ variable "user_settings_table_name" {
   type        = string
 }
 
+variable "balance_checkpoints_table_name" {
+  description = "The name of the DynamoDB table for daily running-balance checkpoints"
+  type        = string
+}
+
+variable "balance_checkpoints_stream_arn" {
+  description = "The stream ARN of the DynamoDB table for daily running-balance checkpoints"
+  type        = string
+}
+
+variable "idempotency_table_name" {
+  description = "The name of the DynamoDB table for idempotency keys"
+  type        = string
+}
+
+variable "idempotency_ttl_seconds" {
+  description = "How long responses are kept for Idempotency-Key replays, in seconds"
+  type        = number
+  default     = 86400
+}
+
 variable "cognito_user_pool_id" {
   description = "The ID of the Cognito User Pool"
   type        = string
@@ -26,4 +47,33 @@ variable "cognito_client_id" {
 variable "api_gateway_execution_arn" {
   description = "The execution ARN of the API Gateway"
   type        = string
-} 
\ No newline at end of file
+} 
+
+variable "fx_rates_bucket" {
+  description = "The S3 bucket holding the FX rate table (leave empty to disable currency conversion)"
+  type        = string
+  default     = ""
+}
+
+variable "fx_rates_key" {
+  description = "The S3 key of the FX rate table JSON file"
+  type        = string
+  default     = "fx/rates.json"
+}
+
+variable "fx_rates_ttl_seconds" {
+  description = "How long a Lambda container caches the FX rate table, in seconds"
+  type        = number
+  default     = 3600
+}
+
+variable "transaction_write_mode" {
+  description = "How create_transaction writes: \"sync\" (direct put) or \"async\" (queued write-behind)"
+  type        = string
+  default     = "sync"
+
+  validation {
+    condition     = contains(["sync", "async"], var.transaction_write_mode)
+    error_message = "transaction_write_mode must be \"sync\" or \"async\"."
+  }
+}
\ No newline at end of file